@@ -0,0 +1,208 @@
+"""Задержки и пропускная способность эндпоинтов API при холодном и теплом кэше.
+
+Запуск (с `--seed` таблица будет очищена и заполнена заново):
+
+    python -m benchmarks.api --seed --days 1500 --rows 2000 --output api.json
+    python -m benchmarks.api --output api.json --compare baseline.json
+
+Запросы идут через ASGI-приложение без сети. При холодном кэше каждый
+запрос вычисляется заново и записывается в кэш, при теплом все ответы
+заранее лежат в кэше. Результат в JSON содержит коммит и размер данных,
+поэтому прогоны разных коммитов можно сравнивать через `--compare`.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import statistics
+import subprocess
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from benchmarks.indexes import LAST_DATE, seed
+from src.app import app
+from src.database.db import engine
+from src.utils.cache import InMemoryCacheBackend, response_cache
+
+OIL_IDS = [f"A{100 + n}" for n in range(0, 60, 7)]
+BASIS_IDS = [f"B{n:02}" for n in range(0, 40, 5)]
+
+SCENARIOS: dict[str, list[str]] = {
+    "last_trading_dates": [f"/last_trading_dates?days={days}" for days in (5, 30)],
+    "trading_results": ["/trading_results"]
+    + [f"/trading_results?oil_id={oil_id}" for oil_id in OIL_IDS]
+    + [f"/trading_results?delivery_basis_id={basis}" for basis in BASIS_IDS],
+    "trading_results per_page=1000": [
+        f"/trading_results?oil_id={oil_id}&per_page=1000" for oil_id in OIL_IDS
+    ],
+    "dynamics month": [
+        f"/dynamics?oil_id={oil_id}&start_date={LAST_DATE.replace(day=1)}"
+        f"&end_date={LAST_DATE}"
+        for oil_id in OIL_IDS
+    ],
+    "dynamics year": [
+        f"/dynamics?delivery_basis_id={basis}&per_page=1000"
+        f"&start_date={LAST_DATE.replace(year=LAST_DATE.year - 1)}"
+        f"&end_date={LAST_DATE}"
+        for basis in BASIS_IDS
+    ],
+}
+
+
+class ColdCacheBackend(InMemoryCacheBackend):
+    """Кэш, в котором никогда нет ответа: каждый запрос — промах с записью."""
+
+    async def get(self, key: str, ranking: str | None = None) -> bytes | None:
+        await super().get(key, ranking)
+        return None
+
+
+def percentile(timings: list[float], value: int) -> float:
+    return statistics.quantiles(timings, n=100, method="inclusive")[value - 1]
+
+
+async def run_scenario(
+    client: AsyncClient, urls: list[str], requests: int, concurrency: int
+) -> dict:
+    """Выполняет `requests` запросов по кругу `urls` в `concurrency` потоков.
+
+    Returns:
+        dict: Перцентили задержки в миллисекундах и запросы в секунду.
+
+    """
+    queue = zip(range(requests), itertools.cycle(urls), strict=False)
+    timings = []
+
+    async def worker() -> None:
+        for _, url in queue:
+            start = time.perf_counter()
+            response = await client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+        "rps": round(requests / elapsed, 1),
+    }
+
+
+async def run_suite(requests: int, concurrency: int) -> dict:
+    """Прогоняет все сценарии при холодном, затем при теплом кэше.
+
+    Returns:
+        dict: Результаты по режимам кэша и сценариям.
+
+    """
+    results: dict[str, dict] = {"cold": {}, "warm": {}}
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://bench/api"
+    ) as client:
+        local_max_entries = response_cache.local.max_entries
+        for name, urls in SCENARIOS.items():
+            response_cache.init(ColdCacheBackend())
+            response_cache.local.max_entries = 0
+            results["cold"][name] = await run_scenario(
+                client, urls, requests, concurrency
+            )
+
+            response_cache.init(InMemoryCacheBackend())
+            response_cache.local.max_entries = local_max_entries
+            for url in urls:
+                (await client.get(url)).raise_for_status()
+            results["warm"][name] = await run_scenario(
+                client, urls, requests, concurrency
+            )
+    return results
+
+
+async def dataset_rows() -> int:
+    async with engine.connect() as connection:
+        await connection.execute(text("ANALYZE spimex_trading_results"))
+        return await connection.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE relname = 'spimex_trading_results'"
+            )
+        )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, baseline: dict | None) -> None:
+    header = (
+        f"{'cache':<5} {'scenario':<30} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}"
+    )
+    if baseline:
+        header += f" {'p95 vs ' + str(baseline.get('commit')):>16}"
+    print(header)
+    for mode, scenarios in report["results"].items():
+        for name, result in scenarios.items():
+            line = (
+                f"{mode:<5} {name:<30} {result['p50_ms']:>6.1f}ms "
+                f"{result['p95_ms']:>6.1f}ms {result['p99_ms']:>6.1f}ms "
+                f"{result['rps']:>8.1f}"
+            )
+            previous = (baseline or {}).get("results", {}).get(mode, {}).get(name)
+            if previous:
+                change = result["p95_ms"] / previous["p95_ms"] - 1
+                line += f" {change:>+15.0%}"
+            print(line)
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--seed", action="store_true")
+    arg_parser.add_argument("--days", type=int, default=1500)
+    arg_parser.add_argument("--rows", type=int, default=2000)
+    arg_parser.add_argument("--requests", type=int, default=200)
+    arg_parser.add_argument("--concurrency", type=int, default=10)
+    arg_parser.add_argument("--output", type=Path)
+    arg_parser.add_argument("--compare", type=Path)
+    args = arg_parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.seed:
+        await seed(args.days, args.rows)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "dataset_rows": await dataset_rows(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "results": await run_suite(args.requests, args.concurrency),
+    }
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
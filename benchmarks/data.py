@@ -0,0 +1,64 @@
+"""Синтетические данные для бенчмарков."""
+
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+from src.parser import Bulletin, SpimexParser
+
+OIL_IDS = [f"A{number:03d}" for number in range(100, 160)]
+DELIVERY_BASIS_IDS = [f"B{number:02d}" for number in range(40)]
+DELIVERY_TYPE_IDS = ["A", "F", "J", "W"]
+
+
+def trading_dates(count: int, end: date = date(2026, 10, 16)) -> list[date]:
+    """Возвращает `count` рабочих дней, заканчивая `end`."""
+    dates = []
+    current = end
+    while len(dates) < count:
+        if current.weekday() < 5:
+            dates.append(current)
+        current -= timedelta(days=1)
+    return sorted(dates)
+
+
+def make_bulletin(trading_date: date, rows: int, seed: int = 0) -> Bulletin:
+    """Создает бюллетень с `rows` строками в формате распарсенного XLS."""
+    rng = random.Random(seed)
+    codes = set()
+    while len(codes) < rows:
+        codes.add(
+            f"{rng.choice(OIL_IDS)}{rng.choice(DELIVERY_BASIS_IDS)}"
+            f"{rng.randint(0, 999):03d}{rng.choice(DELIVERY_TYPE_IDS)}"
+        )
+    codes = sorted(codes)
+    volumes = [rng.randint(60, 6000) for _ in codes]
+    df = pd.DataFrame(
+        {
+            SpimexParser.INSTRUMENT_CODE_COL: codes,
+            SpimexParser.INSTRUMENT_NAME_COL: [
+                f"Бензин ({code[:4]}), ст. {code[4:7]}" for code in codes
+            ],
+            SpimexParser.DELIVERY_BASIS_COL: [f"ст. {code[4:7]}" for code in codes],
+            SpimexParser.VOLUME_COL: [str(volume) for volume in volumes],
+            SpimexParser.TOTAL_COL: [
+                str(volume * rng.randint(40000, 90000)) for volume in volumes
+            ],
+            SpimexParser.COUNT_COL: [str(rng.randint(1, 20)) for _ in codes],
+        }
+    )
+    return Bulletin(
+        url=f"https://spimex.com/upload/reports/oil_xls/oil_xls_{trading_date:%Y%m%d}.xls",
+        date=f"{trading_date:%d.%m.%Y}",
+        content_hash=f"{seed:064x}",
+        df=df,
+    )
+
+
+def make_bulletins(count: int, rows: int) -> list[Bulletin]:
+    """Создает `count` бюллетеней по `rows` строк за последовательные дни."""
+    return [
+        make_bulletin(trading_date, rows, seed=index)
+        for index, trading_date in enumerate(trading_dates(count))
+    ]
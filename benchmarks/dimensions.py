@@ -0,0 +1,193 @@
+"""Размер таблицы и скорость запросов со справочниками и без них.
+
+Запуск:
+
+    python -m benchmarks.dimensions --seed --days 1000 --rows 3000
+
+Рядом с нормализованной `spimex_trading_results` строится денормализованная
+копия `spimex_trading_results_wide` со старой схемой: наименования продукта
+и базиса поставки в каждой строке, те же индексы. Сравниваются размер
+данных, время запросов репозитория без наименований, с `expand=true`
+(соединение со справочниками) и по широкой таблице, а также объем JSON.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import date
+
+from sqlalchemy import Date, Float, Integer, String, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from benchmarks.indexes import ALL_IDS, dynamics_filter, measure, seed, trading_filter
+from src.database.db import Session, engine
+from src.repository.trading_results import TradingResultsRepository
+from src.schemas.trading_results import ExpandedTradingResult
+from src.utils.formats import encode_json
+from src.utils.pagination import Page
+
+WIDE_TABLE = "spimex_trading_results_wide"
+
+CREATE_WIDE_QUERIES = (
+    f"DROP TABLE IF EXISTS {WIDE_TABLE}",
+    f"""
+CREATE TABLE {WIDE_TABLE} AS
+SELECT
+    results.id, results.exchange_product_id, products.exchange_product_name,
+    results.oil_id, results.delivery_basis_id, bases.delivery_basis_name,
+    results.delivery_type_id, results.volume, results.total, results.count,
+    results.date, results.created_on, results.updated_on
+FROM spimex_trading_results AS results
+JOIN spimex_products AS products USING (exchange_product_id)
+JOIN spimex_delivery_bases AS bases USING (delivery_basis_id)
+ORDER BY results.date, results.id
+""",
+    f"ALTER TABLE {WIDE_TABLE} ADD PRIMARY KEY (id, date)",
+    f"CREATE UNIQUE INDEX ON {WIDE_TABLE} (date, exchange_product_id)",
+    f"CREATE INDEX ON {WIDE_TABLE} (date, id)",
+    f"CREATE INDEX ON {WIDE_TABLE} (oil_id, date, id)",
+    f"CREATE INDEX ON {WIDE_TABLE} (delivery_basis_id, date, id)",
+    f"CREATE INDEX ON {WIDE_TABLE} "
+    "(oil_id, delivery_basis_id, delivery_type_id, date, id)",
+    f"ANALYZE {WIDE_TABLE}",
+    "ANALYZE spimex_trading_results",
+    "ANALYZE spimex_products",
+    "ANALYZE spimex_delivery_bases",
+)
+
+# Размер секционированной таблицы складывается из размеров ее секций.
+SIZE_QUERY = """
+SELECT sum(pg_table_size(relid)), sum(pg_indexes_size(relid))
+FROM (
+    SELECT relid FROM pg_partition_tree(CAST(:table AS regclass))
+    UNION
+    SELECT CAST(:table AS regclass)
+) AS tables
+"""
+
+
+class WideBase(DeclarativeBase):
+    pass
+
+
+class WideTradingResults(WideBase):
+    __tablename__ = WIDE_TABLE
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    exchange_product_id: Mapped[str] = mapped_column(String(20))
+    exchange_product_name: Mapped[str] = mapped_column(String(255))
+    oil_id: Mapped[str] = mapped_column(String(4))
+    delivery_basis_id: Mapped[str] = mapped_column(String(3))
+    delivery_basis_name: Mapped[str] = mapped_column(String(255))
+    delivery_type_id: Mapped[str] = mapped_column(String(1))
+    volume: Mapped[float] = mapped_column(Float)
+    total: Mapped[float] = mapped_column(Float)
+    count: Mapped[float] = mapped_column(Float)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+
+class WideTradingResultsRepository(TradingResultsRepository):
+    """Те же запросы репозитория по денормализованной таблице."""
+
+    model = WideTradingResults
+    columns = tuple(
+        WideTradingResults.__table__.c[name]
+        for name in ExpandedTradingResult.model_fields
+    )
+
+
+QUERIES = {
+    "trading_results all ids": lambda expand: trading_filter(
+        per_page=1000, expand=expand, **ALL_IDS
+    ),
+    "dynamics basis_id quarter": lambda expand: dynamics_filter(
+        90, per_page=1000, expand=expand, delivery_basis_id="B07"
+    ),
+    "dynamics all ids year": lambda expand: dynamics_filter(
+        365, per_page=1000, expand=expand, **ALL_IDS
+    ),
+}
+
+
+def scenario(name: str, variant: str) -> Callable[..., Awaitable[Page]]:
+    """Сценарий запроса `name` в одном из вариантов схемы.
+
+    Returns:
+        Callable[..., Awaitable[Page]]: Запрос к репозиторию, как сценарии
+            benchmarks.indexes.
+
+    """
+    method = "get_trading_results" if name.startswith("trading") else "get_dynamics"
+
+    def run(repo: TradingResultsRepository) -> Awaitable[Page]:
+        if variant == "wide":
+            repo = WideTradingResultsRepository(repo.session)
+        return getattr(repo, method)(QUERIES[name](variant == "expand"))
+
+    return run
+
+
+async def get_sizes() -> dict[str, tuple[int, int]]:
+    """Размер данных и индексов в байтах по таблицам.
+
+    Returns:
+        dict[str, tuple[int, int]]: Размер таблицы и ее индексов.
+
+    """
+    tables = (
+        "spimex_trading_results",
+        "spimex_products",
+        "spimex_delivery_bases",
+        WIDE_TABLE,
+    )
+    async with engine.connect() as connection:
+        return {
+            table: tuple(
+                (await connection.execute(text(SIZE_QUERY), {"table": table})).one()
+            )
+            for table in tables
+        }
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--seed", action="store_true")
+    arg_parser.add_argument("--days", type=int, default=1000)
+    arg_parser.add_argument("--rows", type=int, default=3000)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    if args.seed:
+        await seed(args.days, args.rows)
+    async with engine.begin() as connection:
+        for query in CREATE_WIDE_QUERIES:
+            await connection.execute(text(query))
+
+    sizes = await get_sizes()
+    print(f"{'table':<32} {'data MB':>8} {'index MB':>9}")
+    for table, (data, indexes) in sizes.items():
+        print(f"{table:<32} {data / 2**20:>8.1f} {indexes / 2**20:>9.1f}")
+
+    variants = ("compact", "expand", "wide")
+    print(
+        f"\n{'scenario':<28} {'variant':<8} {'rows':>6} "
+        f"{'p50':>8} {'p95':>8} {'JSON':>8}"
+    )
+    for name in QUERIES:
+        for variant in variants:
+            result = await measure(scenario(name, variant), args.repeat)
+            async with Session() as session:
+                page = await scenario(name, variant)(TradingResultsRepository(session))
+            print(
+                f"{name:<28} {variant:<8} {result['rows']:>6} "
+                f"{result['p50_ms']:>6.1f}ms {result['p95_ms']:>6.1f}ms "
+                f"{len(encode_json(page)) / 1024:>6.0f}KB"
+            )
+
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP TABLE {WIDE_TABLE}"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
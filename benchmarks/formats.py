@@ -0,0 +1,90 @@
+"""Размер ответа и время кодирования/декодирования: JSON против Arrow и Parquet.
+
+Запуск (использует данные, загруженные benchmarks.indexes):
+
+    python -m benchmarks.formats --rows 100000
+
+Декодирование измеряется так, как его делает клиент: до pandas.DataFrame.
+"""
+
+import argparse
+import asyncio
+import io
+import time
+from collections.abc import Callable
+
+import orjson
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.indexes import LAST_DATE, dynamics_filter
+from src.database.db import Session, engine
+from src.repository.trading_results import TradingResultsRepository
+from src.utils.formats import ARROW, JSON, PARQUET
+from src.utils.pagination import Page
+
+DECODERS: dict[str, Callable[[bytes], pd.DataFrame]] = {
+    JSON.name: lambda content: pd.DataFrame(orjson.loads(content)["results"]),
+    ARROW.name: lambda content: pa.ipc.open_stream(content).read_pandas(),
+    PARQUET.name: lambda content: pd.read_parquet(io.BytesIO(content)),
+}
+
+
+def best_of(function: Callable, repeat: int) -> float:
+    """Лучшее время выполнения в миллисекундах.
+
+    Returns:
+        float: Время в миллисекундах.
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+async def load_page(rows: int) -> Page:
+    """Читает `rows` строк тем же запросом, что и `/dynamics`.
+
+    Returns:
+        Page: Страница строк результата.
+
+    """
+    results = []
+    async with Session() as session:
+        chunks = TradingResultsRepository(session).stream_dynamics(
+            dynamics_filter((LAST_DATE - LAST_DATE.replace(year=2020)).days), rows
+        )
+        async for chunk in chunks:
+            results.extend(chunk)
+            if len(results) >= rows:
+                break
+    return Page(results=results[:rows])
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    print(f"{'rows':>7} {'format':<8} {'size, KB':>10} {'encode':>10} {'decode':>10}")
+    for rows in args.rows:
+        page = await load_page(rows)
+        for response_format in (JSON, ARROW, PARQUET):
+            content = response_format.encode(page)
+            encode_ms = best_of(lambda: response_format.encode(page), args.repeat)
+            decode = DECODERS[response_format.name]
+            decode_ms = best_of(lambda: decode(content), args.repeat)
+            print(
+                f"{rows:>7} {response_format.name:<8} {len(content) / 1024:>10.0f} "
+                f"{encode_ms:>8.1f}ms {decode_ms:>8.1f}ms"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
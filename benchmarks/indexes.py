@@ -0,0 +1,261 @@
+"""Планы и время запросов TradingResultsRepository без индексов и с ними.
+
+Запуск (нужна БД из настроек, таблица будет очищена):
+
+    python -m benchmarks.indexes --days 1000 --rows 3000 --output indexes.json
+
+Запросы строит сам репозиторий, а их SQL перехватывается через события
+движка и повторяется под `EXPLAIN (ANALYZE, BUFFERS)`.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import event, text
+
+from src.database.db import Session, engine
+from src.filters.dynamics import DynamicsFilter
+from src.filters.trading_results import TradingResultsFilter
+from src.models import Base, SpimexTradingResults
+from src.repository.trading_daily import TradingDailyRepository
+from src.repository.trading_partitions import TradingPartitionsRepository
+from src.repository.trading_results import TradingResultsRepository
+
+LAST_DATE = date(2026, 10, 16)
+
+# Синтетические строки: код инструмента однозначно задает oil_id, базис и тип
+# поставки, как в реальных бюллетенях.
+SEED_QUERY = """
+INSERT INTO spimex_trading_results (
+    exchange_product_id, oil_id, delivery_basis_id, delivery_type_id,
+    volume, total, count, date, created_on, updated_on
+)
+SELECT
+    oil_id || basis_id || lpad(n::text, 5, '0') || type_id,
+    oil_id,
+    basis_id,
+    type_id,
+    60 + (n * 7919 + day) % 6000,
+    (60 + (n * 7919 + day) % 6000) * 50000,
+    1 + n % 20,
+    CAST(:last_date AS date) - day,
+    now(),
+    now()
+FROM generate_series(0, :days - 1) AS day,
+    generate_series(1, :rows) AS n,
+    LATERAL (
+        SELECT
+            'A' || lpad((100 + n % 60)::text, 3, '0') AS oil_id,
+            'B' || lpad((n / 60 % 40)::text, 2, '0') AS basis_id,
+            (ARRAY['A', 'F', 'J', 'W'])[1 + n / 2400 % 4] AS type_id
+    ) AS ids
+"""
+# Наименования длиной как в бюллетенях: «Бензин (АИ-92-К5) по ГОСТ,
+# ст. Биклянь (ст. отправления ОТП)».
+SEED_DIMENSIONS_QUERIES = (
+    """
+INSERT INTO spimex_products (exchange_product_id, exchange_product_name, date)
+SELECT
+    oil_id || basis_id || lpad(n::text, 5, '0') || type_id,
+    'Бензин (' || oil_id || '-К5) по ГОСТ, ст. ' || basis_id
+        || ' (ст. отправления ' || type_id || ')',
+    CAST(:last_date AS date)
+FROM generate_series(1, :rows) AS n,
+    LATERAL (
+        SELECT
+            'A' || lpad((100 + n % 60)::text, 3, '0') AS oil_id,
+            'B' || lpad((n / 60 % 40)::text, 2, '0') AS basis_id,
+            (ARRAY['A', 'F', 'J', 'W'])[1 + n / 2400 % 4] AS type_id
+    ) AS ids
+""",
+    """
+INSERT INTO spimex_delivery_bases (delivery_basis_id, delivery_basis_name, date)
+SELECT
+    'B' || lpad(n::text, 2, '0'),
+    'ст. Новоярославская ' || n,
+    CAST(:last_date AS date)
+FROM generate_series(0, 39) AS n
+""",
+)
+
+
+def trading_filter(**values: str | int | None) -> TradingResultsFilter:
+    params = {
+        "cursor": None,
+        "per_page": 100,
+        "oil_id": None,
+        "delivery_type_id": None,
+        "delivery_basis_id": None,
+        "expand": False,
+    }
+    return TradingResultsFilter(**params | values)
+
+
+def dynamics_filter(days: int, **values: str | int | None) -> DynamicsFilter:
+    params = {
+        "cursor": None,
+        "per_page": 100,
+        "oil_id": None,
+        "delivery_type_id": None,
+        "delivery_basis_id": None,
+        "start_date": LAST_DATE - timedelta(days=days),
+        "end_date": LAST_DATE,
+        "expand": False,
+    }
+    return DynamicsFilter(**params | values)
+
+
+ALL_IDS = {"oil_id": "A100", "delivery_basis_id": "B01", "delivery_type_id": "A"}
+
+SCENARIOS: dict[str, Callable[[TradingResultsRepository], Awaitable]] = {
+    "last_trading_dates": lambda repo: repo.get_last_trading_dates(days=10),
+    "trading_results oil_id": lambda repo: repo.get_trading_results(
+        trading_filter(oil_id="A100")
+    ),
+    "trading_results basis_id": lambda repo: repo.get_trading_results(
+        trading_filter(delivery_basis_id="B07")
+    ),
+    "trading_results all ids": lambda repo: repo.get_trading_results(
+        trading_filter(per_page=1000, **ALL_IDS)
+    ),
+    "dynamics oil_id month": lambda repo: repo.get_dynamics(
+        dynamics_filter(30, per_page=1000, oil_id="A100")
+    ),
+    "dynamics basis_id quarter": lambda repo: repo.get_dynamics(
+        dynamics_filter(90, per_page=1000, delivery_basis_id="B07")
+    ),
+    "dynamics all ids year": lambda repo: repo.get_dynamics(
+        dynamics_filter(365, per_page=1000, **ALL_IDS)
+    ),
+}
+
+
+async def seed(days: int, rows: int) -> None:
+    dates = [LAST_DATE - timedelta(days=day) for day in range(days)]
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            text(
+                "TRUNCATE spimex_trading_results, spimex_products, "
+                "spimex_delivery_bases"
+            )
+        )
+
+    async with Session() as session:
+        await TradingPartitionsRepository(session).ensure(dates)
+        await session.execute(
+            text(SEED_QUERY),
+            {"last_date": LAST_DATE, "days": days, "rows": rows},
+        )
+        for query in SEED_DIMENSIONS_QUERIES:
+            await session.execute(text(query), {"last_date": LAST_DATE, "rows": rows})
+        await TradingDailyRepository(session).refresh(dates)
+        await session.commit()
+
+
+async def set_indexes(enabled: bool) -> None:
+    """Создает или удаляет индексы модели, кроме уникального ограничения."""
+    async with engine.begin() as connection:
+        for index in SpimexTradingResults.__table__.indexes:
+            if enabled:
+                await connection.run_sync(index.create, checkfirst=True)
+            else:
+                await connection.run_sync(index.drop, checkfirst=True)
+        await connection.execute(text("ANALYZE spimex_trading_results"))
+
+
+def capture_statement(scenario: Callable) -> Callable[[], Awaitable[tuple]]:
+    """Возвращает корутину, которая выполняет сценарий и запоминает его SQL."""
+
+    async def run() -> tuple:
+        captured = []
+
+        def before_execute(conn, cursor, statement, parameters, context, many):
+            captured.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_execute)
+        try:
+            async with Session() as session:
+                await scenario(TradingResultsRepository(session))
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_execute)
+        return captured[-1]
+
+    return run
+
+
+async def measure(scenario: Callable, repeat: int) -> dict:
+    """Выполняет сценарий `repeat` раз и снимает план последнего запроса.
+
+    Returns:
+        dict: Медиана и p95 в миллисекундах, число строк и план.
+
+    """
+    statement, parameters = await capture_statement(scenario)()
+    timings = []
+    for _ in range(repeat):
+        async with Session() as session:
+            start = time.perf_counter()
+            result = await scenario(TradingResultsRepository(session))
+            timings.append((time.perf_counter() - start) * 1000)
+
+    async with engine.connect() as connection:
+        plan = await connection.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+        )
+        plan = [line for (line,) in plan]
+
+    return {
+        "p50_ms": statistics.median(timings),
+        "p95_ms": statistics.quantiles(timings, n=20)[-1],
+        "rows": len(getattr(result, "results", result)),
+        "plan": plan,
+    }
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--days", type=int, default=1000)
+    arg_parser.add_argument("--rows", type=int, default=3000)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    arg_parser.add_argument("--output", type=Path)
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    await seed(args.days, args.rows)
+    print(
+        f"Загружено строк: {args.days * args.rows} "
+        f"за {time.perf_counter() - start:.1f} с"
+    )
+
+    results = {}
+    for stage, enabled in (("before", False), ("after", True)):
+        await set_indexes(enabled)
+        results[stage] = {
+            name: await measure(scenario, args.repeat)
+            for name, scenario in SCENARIOS.items()
+        }
+
+    print(f"{'scenario':<32} {'rows':>6} {'before p50':>11} {'after p50':>10}")
+    for name in SCENARIOS:
+        before, after = results["before"][name], results["after"][name]
+        print(
+            f"{name:<32} {after['rows']:>6} "
+            f"{before['p50_ms']:>9.1f}ms {after['p50_ms']:>8.1f}ms"
+        )
+        print(f"    {before['plan'][0]}\n    {after['plan'][0]}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
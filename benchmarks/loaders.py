@@ -0,0 +1,64 @@
+"""Сравнение загрузчиков парсера: multi-VALUES INSERT против COPY.
+
+Запуск (нужна БД из настроек, таблица будет очищена):
+
+    python -m benchmarks.loaders --bulletins 450 --rows 150
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from benchmarks.data import make_bulletins
+from src.database.db import Session, engine
+from src.models import Base
+from src.parser import SpimexParser
+from src.settings.config import settings
+
+
+async def run_loader(parser: SpimexParser, loader: str, bulletins: list) -> float:
+    """Загружает бюллетени в пустую таблицу выбранным загрузчиком.
+
+    Returns:
+        float: Время загрузки в секундах.
+
+    """
+    async with Session() as session:
+        await session.execute(text("TRUNCATE spimex_trading_results"))
+        await session.execute(text("TRUNCATE spimex_bulletins"))
+        await session.commit()
+
+    settings.PARSER_LOADER = loader
+    start = time.perf_counter()
+    await parser.insert_data_to_db(bulletins, {})
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--bulletins", type=int, default=450)
+    arg_parser.add_argument("--rows", type=int, default=150)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    bulletins = make_bulletins(args.bulletins, args.rows)
+    total_rows = args.bulletins * args.rows
+    parser = SpimexParser()
+
+    print(f"{'loader':<8} {'best, s':>9} {'rows/s':>12}")
+    for loader in ("insert", "copy"):
+        best = min(
+            [await run_loader(parser, loader, bulletins) for _ in range(args.repeat)]
+        )
+        print(f"{loader:<8} {best:>9.2f} {total_rows / best:>12.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
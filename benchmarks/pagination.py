@@ -0,0 +1,107 @@
+"""Время ответа страницы в зависимости от глубины: OFFSET против курсора.
+
+Запуск (использует данные, загруженные benchmarks.indexes):
+
+    python -m benchmarks.pagination --pages 1 10 100 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.indexes import trading_filter
+from src.database.db import Session, engine
+from src.models import SpimexTradingResults
+from src.repository.trading_results import TradingResultsRepository
+from src.utils.pagination import encode_cursor
+
+PER_PAGE = 100
+
+
+async def offset_page(depth: int) -> float:
+    """Время выборки страницы `depth` через OFFSET.
+
+    Returns:
+        float: Время в миллисекундах.
+
+    """
+    repo_filter = trading_filter(oil_id="A100")
+    async with Session() as session:
+        repo = TradingResultsRepository(session)
+        query = (
+            (await repo.build_query(repo_filter))
+            .order_by(SpimexTradingResults.date.desc(), SpimexTradingResults.id.desc())
+            .offset(depth * PER_PAGE)
+            .limit(PER_PAGE)
+        )
+        start = time.perf_counter()
+        (await session.execute(query)).all()
+        return (time.perf_counter() - start) * 1000
+
+
+async def cursor_page(cursor: str | None) -> tuple[float, str | None]:
+    """Время выборки страницы после курсора.
+
+    Returns:
+        tuple[float, str | None]: Время в миллисекундах и курсор следующей.
+
+    """
+    async with Session() as session:
+        repo = TradingResultsRepository(session)
+        start = time.perf_counter()
+        page = await repo.get_trading_results(
+            trading_filter(oil_id="A100", cursor=cursor)
+        )
+        return (time.perf_counter() - start) * 1000, page.next_cursor
+
+
+async def cursor_at(depth: int) -> str | None:
+    """Курсор, с которого начинается страница `depth`.
+
+    Returns:
+        str | None: Курсор или None для первой страницы.
+
+    """
+    if depth == 0:
+        return None
+    async with Session() as session:
+        row = (
+            await session.execute(
+                (
+                    await TradingResultsRepository(session).build_query(
+                        trading_filter(oil_id="A100")
+                    )
+                )
+                .order_by(
+                    SpimexTradingResults.date.desc(), SpimexTradingResults.id.desc()
+                )
+                .offset(depth * PER_PAGE - 1)
+                .limit(1)
+            )
+        ).one()
+    return encode_cursor(row.date, row.id)
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[0, 10, 100, 400])
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    print(f"{'page':>6} {'offset p50':>12} {'cursor p50':>12}")
+    for depth in args.pages:
+        cursor = await cursor_at(depth)
+        offset_ms = statistics.median(
+            [await offset_page(depth) for _ in range(args.repeat)]
+        )
+        cursor_ms = statistics.median(
+            [(await cursor_page(cursor))[0] for _ in range(args.repeat)]
+        )
+        print(f"{depth:>6} {offset_ms:>10.1f}ms {cursor_ms:>10.1f}ms")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
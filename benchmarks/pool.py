@@ -0,0 +1,119 @@
+"""Поведение пула соединений под нагрузкой и влияние его настроек.
+
+Запуск (использует данные, загруженные benchmarks.indexes):
+
+    python -m benchmarks.pool --pool-size 5 10 20 --concurrency 10 50 100
+
+Каждая корутина в цикле открывает сессию и выполняет запрос
+`/trading_results` через репозиторий. Ожидание соединения измеряется
+отдельно от запроса: при насыщении пула растет именно оно. Затем при
+фиксированном пуле сравниваются `pool_pre_ping` и кэш подготовленных
+выражений asyncpg.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.indexes import trading_filter
+from src.repository.trading_results import TradingResultsRepository
+from src.settings.config import DATABASE_URL
+
+OIL_IDS = [f"A{100 + n}" for n in range(60)]
+
+
+async def run_load(
+    pool_size: int,
+    concurrency: int,
+    requests: int,
+    pre_ping: bool = False,
+    statement_cache_size: int = 500,
+) -> dict:
+    """Выполняет `requests` запросов по `concurrency` одновременно.
+
+    Returns:
+        dict: Перцентили ожидания соединения и полного запроса в
+            миллисекундах и запросы в секунду.
+
+    """
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_pre_ping=pre_ping,
+        connect_args={"prepared_statement_cache_size": statement_cache_size},
+    )
+    sessions = async_sessionmaker(engine, class_=AsyncSession)
+    oil_ids = itertools.cycle(OIL_IDS)
+    queue = iter(range(requests))
+    waits, latencies = [], []
+
+    async def worker() -> None:
+        for _ in queue:
+            data_filter = trading_filter(oil_id=next(oil_ids))
+            start = time.perf_counter()
+            async with sessions() as session:
+                await session.connection()
+                waits.append((time.perf_counter() - start) * 1000)
+                await TradingResultsRepository(session).get_trading_results(data_filter)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # Прогрев: соединения пула открыты заранее, выражения подготовлены.
+    await asyncio.gather(*(worker() for _ in range(pool_size)))
+    queue = iter(range(requests))
+    waits.clear()
+    latencies.clear()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+
+    def p95(values: list[float]) -> float:
+        return statistics.quantiles(values, n=20)[-1]
+
+    return {
+        "wait_p50_ms": statistics.median(waits),
+        "wait_p95_ms": p95(waits),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": p95(latencies),
+        "rps": requests / elapsed,
+    }
+
+
+def print_row(label: str, result: dict) -> None:
+    print(
+        f"{label:<28} {result['wait_p50_ms']:>8.1f} {result['wait_p95_ms']:>8.1f} "
+        f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['rps']:>8.0f}"
+    )
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--pool-size", type=int, nargs="+", default=[5, 10, 20])
+    arg_parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100])
+    arg_parser.add_argument("--requests", type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    print(f"{'':<28} {'wait p50':>8} {'wait p95':>8} {'p50':>8} {'p95':>8} {'rps':>8}")
+    for pool_size, concurrency in itertools.product(args.pool_size, args.concurrency):
+        result = await run_load(pool_size, concurrency, args.requests)
+        print_row(f"pool={pool_size} clients={concurrency}", result)
+
+    pool_size = args.pool_size[0]
+    variants = {
+        "pre_ping": {"pre_ping": True},
+        "no statement cache": {"statement_cache_size": 0},
+        "defaults": {},
+    }
+    for label, options in variants.items():
+        result = await run_load(pool_size, pool_size, args.requests, **options)
+        print_row(f"pool={pool_size} {label}", result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
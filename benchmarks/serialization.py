@@ -0,0 +1,100 @@
+"""Пропускная способность `/trading_results`: ORM-объекты против проекции строк.
+
+Запуск (использует данные, загруженные benchmarks.indexes):
+
+    python -m benchmarks.serialization --per-page 100 1000 --requests 500
+
+Кэш ответов отключен, поэтому каждый запрос доходит до БД. Прежний вариант
+эндпоинта воспроизводится отдельным приложением: он выбирает модели
+целиком и отдает их FastAPI на сериализацию через jsonable_encoder.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app import app
+from src.database.db import Session, engine
+from src.filters.trading_results import TradingResultsFilter
+from src.models import SpimexTradingResults
+from src.utils.cache import response_cache
+
+legacy_app = FastAPI()
+
+
+async def get_db() -> AsyncSession:
+    async with Session() as session:
+        yield session
+
+
+@legacy_app.get("/api/trading_results", response_model=None)
+async def get_trading_results(
+    data_filter: TradingResultsFilter = Depends(),
+    session: AsyncSession = Depends(get_db),
+) -> list[SpimexTradingResults]:
+    query = (
+        select(SpimexTradingResults)
+        .where(SpimexTradingResults.oil_id == data_filter.oil_id)
+        .order_by(SpimexTradingResults.date.desc(), SpimexTradingResults.id.desc())
+        .limit(data_filter.per_page)
+    )
+    return (await session.execute(query)).scalars().all()
+
+
+async def requests_per_second(
+    target: FastAPI, url: str, requests: int, concurrency: int
+) -> float:
+    """Выполняет `requests` запросов по `concurrency` одновременно.
+
+    Returns:
+        float: Количество запросов в секунду.
+
+    """
+    async with AsyncClient(
+        transport=ASGITransport(target), base_url="http://bench"
+    ) as client:
+        await client.get(url)
+        queue = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in queue:
+                response = await client.get(url)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--per-page", type=int, nargs="+", default=[100, 1000])
+    arg_parser.add_argument("--requests", type=int, default=500)
+    arg_parser.add_argument("--concurrency", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    response_cache.backend = None
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"{'per_page':>8} {'orm rps':>10} {'rows rps':>10} {'gain':>7}")
+    for per_page in args.per_page:
+        url = f"/api/trading_results?oil_id=A100&per_page={per_page}"
+        legacy = await requests_per_second(
+            legacy_app, url, args.requests, args.concurrency
+        )
+        current = await requests_per_second(app, url, args.requests, args.concurrency)
+        print(
+            f"{per_page:>8} {legacy:>10.0f} {current:>10.0f} {current / legacy:>6.1f}x"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
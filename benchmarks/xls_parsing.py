@@ -0,0 +1,78 @@
+"""Микробенчмарк разбора XLS бюллетеней из tests/fixtures/bulletins.
+
+Сравнивает прежний разбор в два чтения `pd.read_excel` с разбором за одно
+чтение листа на движках xlrd и calamine (если установлен python-calamine).
+
+    python -m benchmarks.xls_parsing --repeat 20
+"""
+
+import argparse
+import time
+from importlib.util import find_spec
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+from src.parser import SpimexParser
+
+BULLETINS_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "bulletins"
+
+
+def read_bulletin_two_pass(
+    parser: SpimexParser, content: bytes
+) -> tuple[str, pd.DataFrame]:
+    """Прежний разбор: поиск заголовка и чтение таблицы отдельными вызовами.
+
+    Returns:
+        tuple[str, pd.DataFrame]: Дата и отфильтрованный DataFrame.
+
+    """
+    initial_df = pd.read_excel(BytesIO(content), usecols="B", nrows=30)
+    date = initial_df.iat[2, 0].split()[-1]
+    metric_row_index = initial_df[
+        initial_df.apply(
+            lambda row: row.astype(str).str.contains(parser.TABLE_NAME).any(),
+            axis=1,
+        )
+    ].index
+    skip_rows = range(metric_row_index[0] + 2)
+    valid_df = pd.read_excel(BytesIO(content), usecols="B:F,O", skiprows=skip_rows)
+    return date, parser.filter_dataframe(valid_df)
+
+
+def read_bulletin_single_pass(engine: str):
+    def read(parser: SpimexParser, content: bytes) -> tuple[str, pd.DataFrame]:
+        parser.XLS_ENGINE = engine
+        return parser.read_bulletin(content)
+
+    return read
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    corpus = [path.read_bytes() for path in sorted(BULLETINS_DIR.glob("*.xls"))]
+    variants = {
+        "two-pass xlrd": read_bulletin_two_pass,
+        "single-pass xlrd": read_bulletin_single_pass("xlrd"),
+    }
+    if find_spec("python_calamine"):
+        variants["single-pass calamine"] = read_bulletin_single_pass("calamine")
+
+    parser = SpimexParser()
+    print(f"{len(corpus)} бюллетеней, повторов: {args.repeat}")
+    print(f"{'variant':<22} {'ms/file':>9}")
+    for name, read in variants.items():
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for content in corpus:
+                read(parser, content)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed / (args.repeat * len(corpus)) * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
+from sqlalchemy.schema import SchemaItem
 
 from src.models import Base
 from src.settings.config import DATABASE_URL
@@ -31,6 +33,33 @@ target_metadata = Base.metadata
 
 config.set_main_option("sqlalchemy.url", DATABASE_URL)
 
+# Секции итогов торгов есть в базе, но не в метаданных: секцию по умолчанию
+# создает миграция, годовые секции и отключенные годы — приложение.
+PARTITION_PATTERN = re.compile(
+    r"spimex_trading_results_(default|y\d{4}(_detached_\d+)?)"
+)
+
+
+def include_object(
+    obj: SchemaItem,
+    name: str | None,
+    type_: str,
+    reflected: bool,  # noqa: FBT001 - сигнатура хука Alembic
+    compare_to: SchemaItem | None,
+) -> bool:
+    """Исключает секции `spimex_trading_results` из autogenerate и check.
+
+    Returns:
+        bool: False для секции и ее индексов, колонок и ограничений.
+
+    """
+    table = obj if type_ == "table" else getattr(obj, "table", None)
+    return not (
+        reflected
+        and table is not None
+        and PARTITION_PATTERN.fullmatch(table.name) is not None
+    )
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -48,6 +77,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -57,7 +87,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
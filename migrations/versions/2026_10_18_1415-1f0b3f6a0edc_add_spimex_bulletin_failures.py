@@ -0,0 +1,44 @@
+"""add spimex_bulletin_failures.
+
+Revision ID: 1f0b3f6a0edc
+Revises: 32352885a5ec
+Create Date: 2026-10-18 14:15:48.206115
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1f0b3f6a0edc"
+down_revision: str | None = "32352885a5ec"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spimex_bulletin_failures",
+        sa.Column("url", sa.String(length=255), nullable=False),
+        sa.Column("stage", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_on",
+            sa.DateTime(),
+            server_default=sa.text("TIMEZONE('utc', now())"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_on",
+            sa.DateTime(),
+            server_default=sa.text("TIMEZONE('utc', now())"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("url"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("spimex_bulletin_failures")
@@ -0,0 +1,43 @@
+"""unique date exchange_product_id.
+
+Revision ID: aff496f1e264
+Revises: 1f0b3f6a0edc
+Create Date: 2026-10-18 14:30:41.086213
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "aff496f1e264"
+down_revision: str | None = "1f0b3f6a0edc"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Удаляем дубликаты, оставшиеся от повторных запусков парсера.
+    op.execute(
+        """
+        DELETE FROM spimex_trading_results AS duplicate
+        USING spimex_trading_results AS original
+        WHERE duplicate.date = original.date
+          AND duplicate.exchange_product_id = original.exchange_product_id
+          AND duplicate.id > original.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_spimex_trading_results_date_exchange_product_id",
+        "spimex_trading_results",
+        ["date", "exchange_product_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_spimex_trading_results_date_exchange_product_id",
+        "spimex_trading_results",
+        type_="unique",
+    )
@@ -0,0 +1,38 @@
+"""trading results filter indexes.
+
+Revision ID: 5d0f1b6c8a27
+Revises: aff496f1e264
+Create Date: 2026-10-18 15:00:12.530781
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d0f1b6c8a27"
+down_revision: str | None = "aff496f1e264"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEXES = {
+    "ix_spimex_trading_results_oil_id_date": ["oil_id", "date"],
+    "ix_spimex_trading_results_delivery_basis_id_date": ["delivery_basis_id", "date"],
+    "ix_spimex_trading_results_oil_id_basis_id_type_id_date": [
+        "oil_id",
+        "delivery_basis_id",
+        "delivery_type_id",
+        "date",
+    ],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "spimex_trading_results", columns)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="spimex_trading_results")
@@ -0,0 +1,59 @@
+"""keyset pagination indexes.
+
+Revision ID: b71e4c09d2f3
+Revises: 5d0f1b6c8a27
+Create Date: 2026-10-18 15:30:07.218406
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71e4c09d2f3"
+down_revision: str | None = "5d0f1b6c8a27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+OLD_INDEXES = {
+    "ix_spimex_trading_results_oil_id_date": ["oil_id", "date"],
+    "ix_spimex_trading_results_delivery_basis_id_date": ["delivery_basis_id", "date"],
+    "ix_spimex_trading_results_oil_id_basis_id_type_id_date": [
+        "oil_id",
+        "delivery_basis_id",
+        "delivery_type_id",
+        "date",
+    ],
+}
+
+NEW_INDEXES = {
+    "ix_spimex_trading_results_date_id": ["date", "id"],
+    "ix_spimex_trading_results_oil_id_date_id": ["oil_id", "date", "id"],
+    "ix_spimex_trading_results_delivery_basis_id_date_id": [
+        "delivery_basis_id",
+        "date",
+        "id",
+    ],
+    "ix_spimex_trading_results_oil_id_basis_id_type_id_date_id": [
+        "oil_id",
+        "delivery_basis_id",
+        "delivery_type_id",
+        "date",
+        "id",
+    ],
+}
+
+
+def upgrade() -> None:
+    for name, columns in NEW_INDEXES.items():
+        op.create_index(name, "spimex_trading_results", columns)
+    for name in OLD_INDEXES:
+        op.drop_index(name, table_name="spimex_trading_results")
+
+
+def downgrade() -> None:
+    for name, columns in OLD_INDEXES.items():
+        op.create_index(name, "spimex_trading_results", columns)
+    for name in NEW_INDEXES:
+        op.drop_index(name, table_name="spimex_trading_results")
@@ -0,0 +1,60 @@
+"""add spimex_trading_daily.
+
+Revision ID: e4a9c2d7b315
+Revises: b71e4c09d2f3
+Create Date: 2026-10-18 16:00:41.902117
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a9c2d7b315"
+down_revision: str | None = "b71e4c09d2f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spimex_trading_daily",
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("oil_id", sa.String(length=4), nullable=False),
+        sa.Column("delivery_basis_id", sa.String(length=3), nullable=False),
+        sa.Column("delivery_type_id", sa.String(length=1), nullable=False),
+        sa.Column("volume", sa.Float(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("count", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "date", "oil_id", "delivery_basis_id", "delivery_type_id"
+        ),
+    )
+    op.create_index(
+        "ix_spimex_trading_daily_oil_id_date",
+        "spimex_trading_daily",
+        ["oil_id", "date"],
+    )
+    op.create_index(
+        "ix_spimex_trading_daily_delivery_basis_id_date",
+        "spimex_trading_daily",
+        ["delivery_basis_id", "date"],
+    )
+    # Заполняем итоги по уже загруженным данным.
+    op.execute(
+        """
+        INSERT INTO spimex_trading_daily (
+            date, oil_id, delivery_basis_id, delivery_type_id, volume, total, count
+        )
+        SELECT date, oil_id, delivery_basis_id, delivery_type_id,
+               sum(volume), sum(total), sum(count)
+        FROM spimex_trading_results
+        GROUP BY date, oil_id, delivery_basis_id, delivery_type_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("spimex_trading_daily")
@@ -0,0 +1,79 @@
+"""partition spimex_trading_results by date.
+
+Revision ID: 57f47168f56e
+Revises: e4a9c2d7b315
+Create Date: 2026-10-18 16:30:12.530871
+
+"""
+
+from collections.abc import Sequence
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "57f47168f56e"
+down_revision: str | None = "e4a9c2d7b315"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE = "spimex_trading_results"
+SEQUENCE = f"{TABLE}_id_seq"
+UNIQUE = "uq_spimex_trading_results_date_exchange_product_id"
+INDEXES = {
+    "ix_spimex_trading_results_date_id": ["date", "id"],
+    "ix_spimex_trading_results_oil_id_date_id": ["oil_id", "date", "id"],
+    "ix_spimex_trading_results_delivery_basis_id_date_id": [
+        "delivery_basis_id",
+        "date",
+        "id",
+    ],
+    "ix_spimex_trading_results_oil_id_basis_id_type_id_date_id": [
+        "oil_id",
+        "delivery_basis_id",
+        "delivery_type_id",
+        "date",
+        "id",
+    ],
+}
+
+
+def upgrade() -> None:
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY NONE")
+    op.execute(
+        f"CREATE TABLE {TABLE}_new (LIKE {TABLE} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (date)"
+    )
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE}_new DEFAULT")
+    years = op.get_bind().scalars(
+        sa.text(f"SELECT DISTINCT extract(year FROM date)::int FROM {TABLE}")
+    )
+    for year in years:
+        op.execute(
+            f"CREATE TABLE {TABLE}_y{year} PARTITION OF {TABLE}_new "
+            f"FOR VALUES FROM ('{date(year, 1, 1)}') TO ('{date(year + 1, 1, 1)}')"
+        )
+    op.execute(f"INSERT INTO {TABLE}_new SELECT * FROM {TABLE}")
+    op.drop_table(TABLE)
+    op.rename_table(f"{TABLE}_new", TABLE)
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+    # Ключ секционирования обязан входить в первичный ключ.
+    op.create_primary_key(f"{TABLE}_pkey", TABLE, ["id", "date"])
+    op.create_unique_constraint(UNIQUE, TABLE, ["date", "exchange_product_id"])
+    for name, columns in INDEXES.items():
+        op.create_index(name, TABLE, columns)
+
+
+def downgrade() -> None:
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY NONE")
+    op.execute(f"CREATE TABLE {TABLE}_new (LIKE {TABLE} INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {TABLE}_new SELECT * FROM {TABLE}")
+    # Секции удаляются вместе с секционированной таблицей.
+    op.drop_table(TABLE)
+    op.rename_table(f"{TABLE}_new", TABLE)
+    op.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+    op.create_primary_key(f"{TABLE}_pkey", TABLE, ["id"])
+    op.create_unique_constraint(UNIQUE, TABLE, ["date", "exchange_product_id"])
+    for name, columns in INDEXES.items():
+        op.create_index(name, TABLE, columns)
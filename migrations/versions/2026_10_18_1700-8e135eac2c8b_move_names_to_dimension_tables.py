@@ -0,0 +1,96 @@
+"""move product and delivery basis names to dimension tables.
+
+Revision ID: 8e135eac2c8b
+Revises: 57f47168f56e
+Create Date: 2026-10-18 17:00:27.114503
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e135eac2c8b"
+down_revision: str | None = "57f47168f56e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spimex_products",
+        sa.Column("exchange_product_id", sa.String(length=20), nullable=False),
+        sa.Column("exchange_product_name", sa.String(length=255), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("exchange_product_id"),
+    )
+    op.create_table(
+        "spimex_delivery_bases",
+        sa.Column("delivery_basis_id", sa.String(length=3), nullable=False),
+        sa.Column("delivery_basis_name", sa.String(length=255), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("delivery_basis_id"),
+    )
+    # Наименование каждого кода берем из последнего по дате бюллетеня.
+    op.execute(
+        """
+        INSERT INTO spimex_products (exchange_product_id, exchange_product_name, date)
+        SELECT DISTINCT ON (exchange_product_id)
+               exchange_product_id, exchange_product_name, date
+        FROM spimex_trading_results
+        ORDER BY exchange_product_id, date DESC
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO spimex_delivery_bases (delivery_basis_id, delivery_basis_name, date)
+        SELECT DISTINCT ON (delivery_basis_id)
+               delivery_basis_id, delivery_basis_name, date
+        FROM spimex_trading_results
+        ORDER BY delivery_basis_id, date DESC
+        """
+    )
+    # Колонки удаляются и из всех секций. Место на диске освобождается
+    # после перезаписи секций (VACUUM FULL или pg_repack).
+    op.drop_column("spimex_trading_results", "exchange_product_name")
+    op.drop_column("spimex_trading_results", "delivery_basis_name")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "spimex_trading_results",
+        sa.Column("exchange_product_name", sa.String(length=255)),
+    )
+    op.add_column(
+        "spimex_trading_results",
+        sa.Column("delivery_basis_name", sa.String(length=255)),
+    )
+    # Кода может не быть в справочнике: тогда вместо наименования сам код,
+    # иначе NOT NULL ниже не установится.
+    op.execute(
+        """
+        UPDATE spimex_trading_results AS results
+        SET exchange_product_name = COALESCE(
+                (
+                    SELECT products.exchange_product_name
+                    FROM spimex_products AS products
+                    WHERE products.exchange_product_id = results.exchange_product_id
+                ),
+                results.exchange_product_id
+            ),
+            delivery_basis_name = COALESCE(
+                (
+                    SELECT bases.delivery_basis_name
+                    FROM spimex_delivery_bases AS bases
+                    WHERE bases.delivery_basis_id = results.delivery_basis_id
+                ),
+                results.delivery_basis_id
+            )
+        """
+    )
+    op.alter_column("spimex_trading_results", "exchange_product_name", nullable=False)
+    op.alter_column("spimex_trading_results", "delivery_basis_name", nullable=False)
+    op.drop_table("spimex_delivery_bases")
+    op.drop_table("spimex_products")
@@ -1,43 +1,42 @@
 import logging
 from contextlib import asynccontextmanager
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
-from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
 from redis.asyncio import Redis
 
-from src.routers import trading_results
+from src.database.db import engine, read_sessions, replica_engines
+from src.routers import cache, metrics, trading_results
 from src.settings.config import REDIS_URL, settings
-from src.utils.cache import clear_cache
+from src.utils.cache import RedisCacheBackend, response_cache
+from src.utils.metrics import MetricsMiddleware, instrument_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> None:
     """События жизненного цикла приложения."""
-    logger.info("Настройка кэша и планировщика...")
+    logger.info("Настройка кэша...")
 
     if settings.MODE != "TEST":
         redis = Redis.from_url(REDIS_URL)
-
-        FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
-
-        scheduler.add_job(clear_cache, "cron", hour=14, minute=11)
-        scheduler.start()
-        logger.info("Планировщик запущен")
+        response_cache.init(RedisCacheBackend(redis))
+    await read_sessions.start()
 
     yield
 
+    await read_sessions.stop()
     if settings.MODE != "TEST":
-        logger.info("Остановка планировщика.")
-        scheduler.shutdown()
+        await redis.aclose()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+for number, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine, pool=f"replica-{number}")
 
 app.include_router(trading_results.router, prefix="/api")
+app.include_router(cache.router, prefix="/api")
+app.include_router(metrics.router)
@@ -1,11 +1,44 @@
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
-from src.settings.config import DATABASE_URL
+from src.database.replicas import ReplicaRouter
+from src.settings.config import DATABASE_URL, settings
 
-engine = create_async_engine(DATABASE_URL, pool_pre_ping=True)
 
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        # Кэш подготовленных выражений драйвера на каждом соединении: повторный
+        # запрос репозитория по тому же тексту не разбирается сервером заново.
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        },
+    )
+
+
+engine = create_engine(DATABASE_URL)
+
+# Любая запись, включая запись парсера, идет через эту фабрику в основную базу.
 Session = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+replica_engines = [create_engine(url) for url in settings.DB_REPLICA_URLS]
+
+# Чтение эндпоинтов распределяется по репликам, учитывая их отставание.
+read_sessions = ReplicaRouter(
+    primary=Session,
+    replicas=[
+        async_sessionmaker(bind=replica, class_=AsyncSession, expire_on_commit=False)
+        for replica in replica_engines
+    ],
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+)
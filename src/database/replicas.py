@@ -0,0 +1,116 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import math
+from collections.abc import Sequence
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.utils.metrics import DB_REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+# Реплика, проигравшая весь полученный WAL, не отстает, даже если последняя
+# транзакция на primary была давно. Но если WAL receiver отключен, реплика
+# не знает, сколько WAL она не получила, и равенство LSN ничего не значит:
+# такая реплика считается неисправной (NULL).
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class ReplicaRouter:
+    """Выбирает фабрику сессий для чтения: реплику или primary.
+
+    Отставание реплик проверяется фоновой задачей раз в `check_interval`
+    секунд, поэтому выбор сессии не делает лишних запросов. Недоступные
+    реплики, реплики без работающего WAL receiver и реплики, отстающие
+    больше `max_lag` секунд, пропускаются, а если подходящих нет, чтение
+    идет в primary. До первой проверки чтение тоже идет в primary.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: Sequence[async_sessionmaker[AsyncSession]],
+        max_lag: float,
+        check_interval: float,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.healthy: list[async_sessionmaker[AsyncSession]] = []
+        self.counter = itertools.count()
+        self.task: asyncio.Task | None = None
+
+    def choose(self) -> async_sessionmaker[AsyncSession]:
+        """Возвращает следующую подходящую реплику по кругу или primary."""
+        healthy = self.healthy
+        if not healthy:
+            return self.primary
+        return healthy[next(self.counter) % len(healthy)]
+
+    async def lag(self, replica: async_sessionmaker[AsyncSession]) -> float | None:
+        """Отставание реплики от primary.
+
+        Returns:
+            float | None: Отставание в секундах или None, если реплика
+                не получает WAL от primary.
+
+        """
+        async with replica() as session:
+            lag = await session.scalar(LAG_QUERY)
+        return None if lag is None else float(lag)
+
+    async def refresh(self) -> None:
+        """Проверяет реплики и обновляет список подходящих для чтения."""
+        healthy = []
+        for number, replica in enumerate(self.replicas):
+            try:
+                lag = await asyncio.wait_for(self.lag(replica), self.check_interval)
+            except (OSError, SQLAlchemyError, asyncpg.PostgresError, TimeoutError):
+                logger.warning("Реплика %s недоступна", number, exc_info=True)
+                continue
+            if lag is None:
+                logger.warning("Реплика %s не получает WAL от primary", number)
+                DB_REPLICA_LAG.labels(str(number)).set(math.inf)
+                continue
+            DB_REPLICA_LAG.labels(str(number)).set(lag)
+            if lag <= self.max_lag:
+                healthy.append(replica)
+            else:
+                logger.warning("Реплика %s отстает на %.1f с", number, lag)
+        self.healthy = healthy
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.refresh()
+
+    async def start(self) -> None:
+        if self.replicas and self.task is None:
+            await self.refresh()
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
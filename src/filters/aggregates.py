@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Literal
+
+from fastapi import Query
+
+from src.filters.dynamics import DynamicsPeriodFilter
+
+
+@dataclass
+class AggregatesFilter(DynamicsPeriodFilter):
+    period: Literal["day", "week", "month"] = Query(
+        "day", description="Aggregation bucket."
+    )
+    group_by: Literal["oil_id", "delivery_basis_id", "delivery_type_id"] = Query(
+        "oil_id", description="Column to group by."
+    )
@@ -2,16 +2,12 @@ from dataclasses import dataclass
 
 from fastapi import Query
 
+from src.settings.config import settings
+
 
 @dataclass
 class BaseFilter:
-    page: int | None = Query(default=None)
-    per_page: int = Query(ge=1, le=100, default=100)
-
-    @property
-    def offset(self) -> int:
-        return self.page * self.per_page if self.page else 0
-
-    @property
-    def limit(self) -> int | None:
-        return self.per_page if self.page is not None else None
+    cursor: str | None = Query(
+        default=None, description="Token from `next_cursor` of the previous page."
+    )
+    per_page: int = Query(ge=1, le=settings.API_MAX_PAGE_SIZE, default=100)
@@ -3,11 +3,12 @@ from datetime import date
 
 from fastapi import HTTPException, Query
 
-from src.filters.trading_results import TradingResultsFilter
+from src.filters.base import BaseFilter
+from src.filters.trading_results import ExpandFilter, ProductFilter
 
 
 @dataclass
-class DynamicsFilter(TradingResultsFilter):
+class DynamicsPeriodFilter(ProductFilter):
     start_date: date = Query(..., description="Start date for filtering.")
     end_date: date = Query(..., description="End date for filtering.")
 
@@ -17,3 +18,13 @@ class DynamicsFilter(TradingResultsFilter):
                 status_code=400,
                 detail="`start_date` must be less than or equal to `end_date`.",
             )
+
+
+@dataclass
+class DynamicsExportFilter(DynamicsPeriodFilter, ExpandFilter):
+    pass
+
+
+@dataclass
+class DynamicsFilter(BaseFilter, DynamicsExportFilter):
+    pass
@@ -6,7 +6,21 @@ from src.filters.base import BaseFilter
 
 
 @dataclass
-class TradingResultsFilter(BaseFilter):
+class ProductFilter:
     oil_id: str | None = Query(None)
     delivery_type_id: str | None = Query(None)
     delivery_basis_id: str | None = Query(None)
+
+
+@dataclass
+class ExpandFilter:
+    expand: bool = Query(
+        default=False,
+        description="Add `exchange_product_name` and `delivery_basis_name` "
+        "from the product and delivery basis dimensions.",
+    )
+
+
+@dataclass
+class TradingResultsFilter(BaseFilter, ProductFilter, ExpandFilter):
+    pass
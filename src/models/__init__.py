@@ -1,7 +1,17 @@
 __all__ = [
     "Base",
+    "SpimexBulletin",
+    "SpimexBulletinFailure",
+    "SpimexDeliveryBasis",
+    "SpimexProduct",
+    "SpimexTradingDaily",
     "SpimexTradingResults",
 ]
 
 from src.models.base import Base
+from src.models.bulletin_failures import SpimexBulletinFailure
+from src.models.bulletins import SpimexBulletin
+from src.models.delivery_bases import SpimexDeliveryBasis
+from src.models.products import SpimexProduct
+from src.models.trading_daily import SpimexTradingDaily
 from src.models.trading_results import SpimexTradingResults
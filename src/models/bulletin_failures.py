@@ -0,0 +1,22 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+from src.utils.custom_types import created_at, updated_at
+
+
+class SpimexBulletinFailure(Base):
+    """Бюллетени, которые не удалось скачать, разобрать или загрузить.
+
+    Инкрементальный запуск обходит страницы только до уже загруженных
+    бюллетеней, поэтому неудачные ссылки запоминаются здесь и повторяются
+    при каждом запуске, пока бюллетень не попадет в журнал.
+    """
+
+    __tablename__ = "spimex_bulletin_failures"
+
+    url: Mapped[str] = mapped_column(String(255), primary_key=True)
+    stage: Mapped[str] = mapped_column(String(16), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    created_on: Mapped[created_at]
+    updated_on: Mapped[updated_at]
@@ -0,0 +1,26 @@
+from datetime import date
+
+from sqlalchemy import Date, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+from src.utils.custom_types import (
+    created_at,
+    integer_pk,
+    not_nullable_str_with_limit,
+    updated_at,
+)
+
+
+class SpimexBulletin(Base):
+    """Журнал загруженных бюллетеней с итогами торгов."""
+
+    __tablename__ = "spimex_bulletins"
+
+    id: Mapped[integer_pk]
+    url: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    content_hash: Mapped[not_nullable_str_with_limit(64)]
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_on: Mapped[created_at]
+    updated_on: Mapped[updated_at]
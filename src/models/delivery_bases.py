@@ -0,0 +1,20 @@
+from datetime import date
+
+from sqlalchemy import Date, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+from src.utils.custom_types import not_nullable_str_with_limit
+
+
+class SpimexDeliveryBasis(Base):
+    """Справочник базисов поставки: наименование базиса по его коду.
+
+    Поддерживается парсером так же, как справочник продуктов.
+    """
+
+    __tablename__ = "spimex_delivery_bases"
+
+    delivery_basis_id: Mapped[str] = mapped_column(String(3), primary_key=True)
+    delivery_basis_name: Mapped[not_nullable_str_with_limit(255)]
+    date: Mapped[date] = mapped_column(Date, nullable=False)
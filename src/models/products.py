@@ -0,0 +1,22 @@
+from datetime import date
+
+from sqlalchemy import Date, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+from src.utils.custom_types import not_nullable_str_with_limit
+
+
+class SpimexProduct(Base):
+    """Справочник продуктов: наименование инструмента по его коду.
+
+    Поддерживается парсером; `date` — дата бюллетеня, из которого взято
+    наименование, чтобы повторная загрузка старого бюллетеня не затирала
+    более новое.
+    """
+
+    __tablename__ = "spimex_products"
+
+    exchange_product_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    exchange_product_name: Mapped[not_nullable_str_with_limit(255)]
+    date: Mapped[date] = mapped_column(Date, nullable=False)
@@ -0,0 +1,33 @@
+from datetime import date
+
+from sqlalchemy import Date, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+from src.utils.custom_types import not_nullable_float
+
+
+class SpimexTradingDaily(Base):
+    """Дневные итоги торгов по продукту, базису и типу поставки.
+
+    Таблица поддерживается парсером при загрузке бюллетеней и используется
+    для агрегатов и списка торговых дат вместо полной таблицы итогов.
+    """
+
+    __tablename__ = "spimex_trading_daily"
+    __table_args__ = (
+        Index("ix_spimex_trading_daily_oil_id_date", "oil_id", "date"),
+        Index(
+            "ix_spimex_trading_daily_delivery_basis_id_date",
+            "delivery_basis_id",
+            "date",
+        ),
+    )
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    oil_id: Mapped[str] = mapped_column(String(4), primary_key=True)
+    delivery_basis_id: Mapped[str] = mapped_column(String(3), primary_key=True)
+    delivery_type_id: Mapped[str] = mapped_column(String(1), primary_key=True)
+    volume: Mapped[not_nullable_float]
+    total: Mapped[not_nullable_float]
+    count: Mapped[not_nullable_float]
@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date
+from sqlalchemy import DDL, Date, Index, UniqueConstraint, event
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.base import Base
@@ -14,18 +14,60 @@ from src.utils.custom_types import (
 
 
 class SpimexTradingResults(Base):
+    """Итоги торгов по инструменту за день.
+
+    Хранятся только коды и числовые колонки; наименования продукта и базиса
+    поставки вынесены в справочники SpimexProduct и SpimexDeliveryBasis.
+    """
+
     __tablename__ = "spimex_trading_results"
+    __table_args__ = (
+        UniqueConstraint(
+            "date",
+            "exchange_product_id",
+            name="uq_spimex_trading_results_date_exchange_product_id",
+        ),
+        # Индексы под фильтры TradingResultsRepository: равенство по
+        # идентификаторам, затем ключ пагинации (date, id) для диапазона
+        # дат и сортировки.
+        Index("ix_spimex_trading_results_date_id", "date", "id"),
+        Index("ix_spimex_trading_results_oil_id_date_id", "oil_id", "date", "id"),
+        Index(
+            "ix_spimex_trading_results_delivery_basis_id_date_id",
+            "delivery_basis_id",
+            "date",
+            "id",
+        ),
+        Index(
+            "ix_spimex_trading_results_oil_id_basis_id_type_id_date_id",
+            "oil_id",
+            "delivery_basis_id",
+            "delivery_type_id",
+            "date",
+            "id",
+        ),
+        # Годовые секции по дате торгов создает парсер при загрузке, см.
+        # TradingPartitionsRepository.
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
     id: Mapped[integer_pk]
     exchange_product_id: Mapped[not_nullable_str_with_limit(20)]
-    exchange_product_name: Mapped[not_nullable_str_with_limit(255)]
     oil_id: Mapped[not_nullable_str_with_limit(4)]
     delivery_basis_id: Mapped[not_nullable_str_with_limit(3)]
-    delivery_basis_name: Mapped[not_nullable_str_with_limit(255)]
     delivery_type_id: Mapped[not_nullable_str_with_limit(1)]
     volume: Mapped[not_nullable_float]
     total: Mapped[not_nullable_float]
     count: Mapped[not_nullable_float]
-    date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Ключ секционирования обязан входить в первичный ключ.
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
     created_on: Mapped[created_at]
     updated_on: Mapped[updated_at]
+
+
+# Секция по умолчанию принимает строки лет, для которых секция еще не создана.
+event.listen(
+    SpimexTradingResults.__table__,
+    "after_create",
+    DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"),
+)
@@ -1,18 +1,36 @@
+import argparse
 import asyncio
+import hashlib
 import logging
+import os
 import re
 import time
-from datetime import datetime
+from collections.abc import AsyncIterator, Coroutine, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from importlib.util import find_spec
 from io import BytesIO
 from typing import Any
 
-import aiohttp
+import httpx
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
-from sqlalchemy import insert
+from redis.asyncio import Redis
+from sqlalchemy import delete, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import Session
 from src.models.trading_results import SpimexTradingResults
+from src.repository.bulletins import BulletinsRepository
+from src.repository.dimensions import DimensionsRepository
+from src.repository.trading_daily import TradingDailyRepository
+from src.repository.trading_partitions import TradingPartitionsRepository
+from src.settings.config import REDIS_URL, settings
+from src.utils.cache import RedisCacheBackend, response_cache
+from src.utils.http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(format="%(message)s", level=logging.INFO)
@@ -38,6 +56,20 @@ def time_execution(func: callable) -> callable:
     return wrapper
 
 
+# Дата торгов, хэш содержимого XLS и колонки таблицы в виде массивов numpy.
+DecodedBulletin = tuple[str, str, dict[str, np.ndarray]]
+
+
+@dataclass
+class Bulletin:
+    """Бюллетень с итогами торгов, скачанный по ссылке."""
+
+    url: str
+    date: str
+    content_hash: str
+    df: pd.DataFrame
+
+
 class SpimexParser:
     INSTRUMENT_CODE_COL = "Код\nИнструмента"
     INSTRUMENT_NAME_COL = "Наименование\nИнструмента"
@@ -46,67 +78,264 @@ class SpimexParser:
     TOTAL_COL = "Обьем\nДоговоров,\nруб."
     COUNT_COL = "Количество\nДоговоров,\nшт."
 
-    def __init__(self) -> None:
+    MAX_PAGES = 45
+
+    RECORD_COLUMNS = (
+        "exchange_product_id",
+        "oil_id",
+        "delivery_basis_id",
+        "delivery_type_id",
+        "volume",
+        "total",
+        "count",
+        "date",
+    )
+    STAGING_TABLE = "spimex_trading_results_staging"
+
+    TEXT_COLUMNS = (INSTRUMENT_CODE_COL, INSTRUMENT_NAME_COL, DELIVERY_BASIS_COL)
+    NUMERIC_COLUMNS = (VOLUME_COL, TOTAL_COL, COUNT_COL)
+
+    TABLE_NAME = "Единица измерения: Метрическая тонна"
+    XLS_LINK = re.compile(r"/[^/?]+\.xls")
+    XLS_ENGINE = "calamine" if find_spec("python_calamine") else "xlrd"
+
+    def __init__(self, *, incremental: bool = True, offline: bool = False) -> None:
         self.base_url = (
             "https://spimex.com/markets/oil_products/trades/results/?page=page-"
         )
+        self.incremental = incremental
+        self.offline = offline
+        self.loaded_dates: set[date] = set()
 
     @time_execution
     async def parse(self) -> None:
-        """Основная функция парсинга."""
-        links = await self.parse_spimex_results()
-        data_to_insert = await self.parse_xls_files_from_links(links)
-        await self.insert_data_to_db(data_to_insert)
+        """Основная функция парсинга.
 
-    @time_execution
-    async def parse_spimex_results(self) -> list[str]:
-        """Парсит страницы сайта с итогами торгов с начала 2023 года.
+        Этапы «ссылки → скачивание → разбор → загрузка» связаны ограниченными
+        очередями и работают одновременно: каждый бюллетень записывается в БД
+        сразу после разбора и не держится в памяти до конца запуска.
+        """
+        async with Session() as async_session:
+            repository = BulletinsRepository(async_session)
+            ingested = await repository.get_ingested()
+            failed = await repository.get_failed()
+
+        links = asyncio.Queue(settings.PARSER_QUEUE_SIZE)
+        contents = asyncio.Queue(settings.PARSER_QUEUE_SIZE)
+        bulletins = asyncio.Queue(settings.PARSER_QUEUE_SIZE)
+        downloaders = settings.PARSER_HTTP_CONCURRENCY
+        decoders = settings.PARSER_WORKERS or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=decoders) as pool:
+            async with (
+                HttpClient.from_settings(offline=self.offline) as client,
+                asyncio.TaskGroup() as task_group,
+            ):
+                task_group.create_task(
+                    self._run_stage(
+                        [self._list_links(client, ingested, failed, links)],
+                        links,
+                        downloaders,
+                    )
+                )
+                task_group.create_task(
+                    self._run_stage(
+                        [
+                            self._download_links(client, links, contents)
+                            for _ in range(downloaders)
+                        ],
+                        contents,
+                        decoders,
+                    )
+                )
+                task_group.create_task(
+                    self._run_stage(
+                        [
+                            self._decode_contents(pool, contents, bulletins)
+                            for _ in range(decoders)
+                        ],
+                        bulletins,
+                        1,
+                    )
+                )
+                task_group.create_task(self._load_bulletins(bulletins, ingested))
+
+        if self.loaded_dates:
+            await warm_up_cache()
+
+    @staticmethod
+    async def _run_stage(
+        workers: list[Coroutine], outbox: asyncio.Queue, consumers: int
+    ) -> None:
+        """Дожидается воркеров этапа и сообщает следующему этапу о завершении."""
+        await asyncio.gather(*workers)
+        for _ in range(consumers):
+            await outbox.put(None)
+
+    @staticmethod
+    async def _take_batch(inbox: asyncio.Queue, size: int) -> list | None:
+        """Ждет первый элемент очереди и добирает уже готовые до `size`.
 
         Returns:
-            list[str]: Список ссылок на XLS файлы.
+            list | None: Пачка элементов или None, если этап завершен.
 
         """
-        async with aiohttp.ClientSession() as async_session:
-            tasks = [
-                self.fetch_links(async_session, f"{self.base_url}{page}")
-                for page in range(1, 46)
-            ]
-            results = await asyncio.gather(*tasks)
-        return self.collect_xls_links(results)
+        item = await inbox.get()
+        if item is None:
+            return None
+
+        batch = [item]
+        while len(batch) < size and not inbox.empty():
+            item = inbox.get_nowait()
+            if item is None:
+                # Возвращаем маркер завершения для следующего вызова.
+                inbox.put_nowait(None)
+                break
+            batch.append(item)
+        return batch
+
+    async def _list_links(
+        self,
+        client: HttpClient,
+        ingested: dict[str, str],
+        failed: Sequence[str],
+        outbox: asyncio.Queue,
+    ) -> None:
+        """Этап получения ссылок: со страниц сайта или из дискового кэша."""
+        if self.offline:
+            for link in client.cache.urls() if client.cache else []:
+                await outbox.put(link)
+            return
+
+        async for link in self.iter_xls_links(client, ingested, failed):
+            await outbox.put(link)
+
+    async def _download_links(
+        self, client: HttpClient, inbox: asyncio.Queue, outbox: asyncio.Queue
+    ) -> None:
+        """Этап скачивания XLS файлов.
+
+        Бюллетень, который не удалось скачать после всех повторов, не попадает
+        в журнал, запоминается как неудачный и будет загружен при следующем
+        запуске.
+        """
+        while (xls_link := await inbox.get()) is not None:
+            if not self.XLS_LINK.search(xls_link):
+                continue
+            content = await client.download(xls_link)
+            if content is None:
+                await self._record_failures([xls_link], "download")
+            else:
+                await outbox.put((xls_link, content))
 
     @staticmethod
-    def collect_xls_links(results: tuple[list[str]]) -> list[str]:
-        """Собирает все XLS ссылки из результатов парсинга страниц.
+    async def _decode_contents(
+        pool: ProcessPoolExecutor, inbox: asyncio.Queue, outbox: asyncio.Queue
+    ) -> None:
+        """Этап разбора XLS пачками до `PARSER_CHUNK_SIZE` в пуле процессов.
 
-        Returns:
-            list[str]: Список собранных XLS ссылок.
+        Бюллетени, которые не удалось разобрать, пропускаются и запоминаются
+        для повтора при следующем запуске.
+        """
+        loop = asyncio.get_running_loop()
+        while batch := await SpimexParser._take_batch(
+            inbox, settings.PARSER_CHUNK_SIZE
+        ):
+            decoded = await loop.run_in_executor(
+                pool, decode_bulletins, [content for _, content in batch]
+            )
+            failed = []
+            for (xls_link, _), bulletin in zip(batch, decoded, strict=True):
+                if bulletin is None:
+                    failed.append(xls_link)
+                    continue
+                trading_date, content_hash, columns = bulletin
+                await outbox.put(
+                    Bulletin(
+                        url=xls_link,
+                        date=trading_date,
+                        content_hash=content_hash,
+                        df=pd.DataFrame(columns),
+                    )
+                )
+            if failed:
+                await SpimexParser._record_failures(failed, "decode")
 
+    async def _load_bulletins(
+        self, inbox: asyncio.Queue, ingested: dict[str, str]
+    ) -> None:
+        """Этап загрузки: пишет в БД уже разобранные бюллетени.
+
+        Новые и изменившиеся бюллетени, накопившиеся в очереди к моменту
+        записи (не больше `PARSER_CHUNK_SIZE`), загружаются одной транзакцией.
         """
-        xls_links = []
-        for result in results:
-            xls_links.extend(result)
-        return xls_links
+        loaded = 0
+        while batch := await self._take_batch(inbox, settings.PARSER_CHUNK_SIZE):
+            changed = [
+                bulletin
+                for bulletin in batch
+                if ingested.get(bulletin.url) != bulletin.content_hash
+            ]
+            if changed:
+                await self.insert_data_to_db(changed, ingested)
+                loaded += len(changed)
+        logger.info("Загружено новых и изменившихся бюллетеней: %s", loaded)
+
+    async def iter_xls_links(
+        self, client: HttpClient, ingested: dict[str, str], failed: Sequence[str] = ()
+    ) -> AsyncIterator[str]:
+        """Отдает ссылки на XLS файлы по мере обхода страниц.
+
+        В инкрементальном режиме сначала повторяются бюллетени, которые не
+        удалось загрузить ранее, затем страницы обходятся по порядку до
+        первой, все бюллетени которой уже есть в журнале. Изменившиеся
+        бюллетени за этой страницей находит только полный обход (`--full`).
 
-    async def fetch_links(self, session: aiohttp.ClientSession, url: str) -> list[str]:
+        Yields:
+            str: Ссылка на XLS файл.
+
+        """
+        if not self.incremental or not ingested:
+            tasks = [
+                self.fetch_links(client, f"{self.base_url}{page}")
+                for page in range(1, self.MAX_PAGES + 1)
+            ]
+            for task in asyncio.as_completed(tasks):
+                for link in await task:
+                    yield link
+            return
+
+        retried = set(failed)
+        for link in failed:
+            yield link
+
+        for page in range(1, self.MAX_PAGES + 1):
+            page_links = await self.fetch_links(client, f"{self.base_url}{page}")
+            for link in page_links:
+                if link not in ingested and link not in retried:
+                    yield link
+            if all(link in ingested for link in page_links):
+                break
+
+    async def fetch_links(self, client: HttpClient, url: str) -> list[str]:
         """Функция для получения ссылок с одной страницы.
 
         Returns:
             list[str]: Список ссылок на XLS файлы.
 
         """
-        page_content = await self.get_page_content(session, url)
+        page_content = await self.get_page_content(client, url)
         return self.extract_xls_links_from_page(page_content)
 
     @staticmethod
-    async def get_page_content(session: aiohttp.ClientSession, url: str) -> str:
+    async def get_page_content(client: HttpClient, url: str) -> str:
         """Получает содержимое страницы по URL.
 
         Returns:
             str: Содержимое страницы в виде строки.
 
         """
-        async with session.get(url) as response:
-            return await response.text()
+        return await client.get_text(url)
 
     def extract_xls_links_from_page(self, page_content: str) -> list[str]:
         """Извлекает XLS ссылки из содержимого страницы.
@@ -150,53 +379,59 @@ class SpimexParser:
             and not href.startswith("/upload/reports/oil_xls/oil_xls_2022")
         )
 
-    @time_execution
-    async def parse_xls_files_from_links(self, links: list[str]) -> tuple[Any]:
-        """Парсит все XLS файлы и возвращает данные для вставки.
+    @staticmethod
+    async def _record_failures(urls: list[str], stage: str) -> None:
+        """Запоминает бюллетени, которые нужно повторить при следующем запуске."""
+        async with Session() as async_session:
+            await BulletinsRepository(async_session).save_failed(urls, stage)
+            await async_session.commit()
+        logger.warning("Бюллетени будут повторены (%s): %s", stage, ", ".join(urls))
+
+    def decode_bulletin(self, content: bytes) -> DecodedBulletin:
+        """Разбирает бюллетень в компактный вид для передачи между процессами.
 
         Returns:
-            tuple[str, pd.DataFrame]: Дата и соответствующий DataFrame.
+            DecodedBulletin: Дата, хэш содержимого и массивы колонок.
 
         """
-        return await asyncio.gather(*(self.parse_xls_files(link) for link in links))
+        date, df = self.read_bulletin(content)
+        columns = {
+            column: (
+                pd.to_numeric(df[column]).to_numpy(dtype=np.float64)
+                if column in self.NUMERIC_COLUMNS
+                else df[column].astype(str).to_numpy()
+            )
+            for column in (*self.TEXT_COLUMNS, *self.NUMERIC_COLUMNS)
+        }
+        return date, hashlib.sha256(content).hexdigest(), columns
+
+    def read_bulletin(self, content: bytes) -> tuple[str, pd.DataFrame]:
+        """Разбирает бюллетень за одно чтение листа.
 
-    async def parse_xls_files(self, xls_link: str) -> tuple[str, pd.DataFrame]:
-        """Парсит бюллетени из формата xls в dataframe.
+        Дата торгов, заголовок таблицы в метрических тоннах и строка «Итого»
+        ищутся в одном и том же DataFrame, прочитанном без заголовка.
 
         Returns:
-            tuple[str, pd.DataFrame]: Дата и соответствующий DataFrame.
+            tuple[str, pd.DataFrame]: Дата и отфильтрованный DataFrame.
 
         """
-        async with (
-            aiohttp.ClientSession() as async_session,
-            async_session.get(xls_link) as response,
-        ):
-            match = re.search(r"/([^/?]+\.xls)", xls_link)
-            table_name = "Единица измерения: Метрическая тонна"
-
-            if match:
-                content = await response.read()
-
-                initial_df = pd.read_excel(BytesIO(content), usecols="B", nrows=30)
-                date = self.get_date_from_df(initial_df)
-
-                metric_row_index = self.find_metric_row_index(
-                    initial_df, table_name=table_name
-                )
-                valid_df = self.process_valid_dataframe(content, metric_row_index)
-                filtered_df = self.filter_dataframe(valid_df)
-                return date, filtered_df
-            return "", pd.DataFrame()
+        sheet = pd.read_excel(
+            BytesIO(content), header=None, usecols="B:F,O", engine=self.XLS_ENGINE
+        )
+        date = self.get_date_from_df(sheet)
+        metric_row_index = self.find_metric_row_index(sheet, table_name=self.TABLE_NAME)
+        valid_df = self.process_valid_dataframe(sheet, metric_row_index)
+        return date, self.filter_dataframe(valid_df)
 
     @staticmethod
     def get_date_from_df(df: pd.DataFrame) -> str:
-        """Извлекает дату из DataFrame.
+        """Извлекает дату из DataFrame листа («Дата торгов: ДД.ММ.ГГГГ»).
 
         Returns:
             str: Извлеченная дата в строковом формате.
 
         """
-        return df.iat[2, 0].split()[-1]
+        return df.iat[3, 0].split()[-1]
 
     @staticmethod
     def find_metric_row_index(df: pd.DataFrame, table_name: str) -> pd.Index:
@@ -206,26 +441,28 @@ class SpimexParser:
             pd.Index: Индекс строки с таблицей.
 
         """
-        return df[
-            df.apply(
-                lambda row: row.astype(str).str.contains(table_name).any(),
-                axis=1,
-            )
-        ].index
+        first_column = df.iloc[:, 0]
+        return first_column.index[
+            first_column.astype(str).str.contains(table_name, regex=False)
+        ]
 
     @staticmethod
     def process_valid_dataframe(
-        content: bytes, metric_row_index: pd.Index
+        sheet: pd.DataFrame, metric_row_index: pd.Index
     ) -> pd.DataFrame:
-        """Обрабатывает Excel файл, возвращая DataFrame.
+        """Выделяет из листа таблицу, следующую за строкой с ее названием.
 
         Returns:
             pd.DataFrame: Обработанный DataFrame.
 
         """
         if not metric_row_index.empty:
-            skip_rows = range(metric_row_index[0] + 2)
-            return pd.read_excel(BytesIO(content), usecols="B:F,O", skiprows=skip_rows)
+            header_row = metric_row_index[0] + 1
+            return (
+                sheet.iloc[header_row + 1 :]
+                .set_axis(sheet.iloc[header_row].tolist(), axis=1)
+                .reset_index(drop=True)
+            )
         return pd.DataFrame()
 
     def filter_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -243,88 +480,328 @@ class SpimexParser:
         return df[(df[self.COUNT_COL] != "-")].iloc[1:]
 
     @time_execution
-    async def insert_data_to_db(self, data_to_insert: tuple[Any]) -> None:
-        """Вставляет данные в БД."""
-        all_data = [
-            self.create_spimex_trading_results(df, date) for date, df in data_to_insert
+    async def insert_data_to_db(
+        self, bulletins: list[Bulletin], ingested: dict[str, str]
+    ) -> None:
+        """Вставляет данные новых и изменившихся бюллетеней в БД.
+
+        Строки изменившихся бюллетеней перед вставкой удаляются, секции за
+        новые годы создаются, справочники продуктов и базисов пополняются, а
+        сами бюллетени записываются в журнал, а дневные итоги за их даты
+        пересчитываются в той же транзакции. После фиксации из кэша ответов
+        удаляются ключи, затронутые загруженными датами.
+        """
+        if not bulletins:
+            logger.info("Нет новых бюллетеней.")
+            return
+
+        changed_dates = [
+            self.parse_date(bulletin.date)
+            for bulletin in bulletins
+            if bulletin.url in ingested
         ]
-        await self.bulk_insert_data_to_db(
-            [item for sublist in all_data for item in sublist]
-        )
+        dates = {self.parse_date(bulletin.date) for bulletin in bulletins}
+
+        async with Session() as async_session:
+            try:
+                if changed_dates:
+                    await async_session.execute(
+                        delete(SpimexTradingResults).where(
+                            SpimexTradingResults.date.in_(changed_dates)
+                        )
+                    )
+                created = await TradingPartitionsRepository(async_session).ensure(dates)
+                if created:
+                    logger.info("Созданы секции: %s", ", ".join(created))
+                await DimensionsRepository(async_session).save(
+                    *self.build_dimensions(bulletins)
+                )
+                records = self.build_records(bulletins)
+                if settings.PARSER_LOADER == "copy":
+                    await self.copy_data_to_db(async_session, records)
+                else:
+                    await self.bulk_insert_data_to_db(async_session, records)
+                await BulletinsRepository(async_session).save(
+                    {
+                        "url": bulletin.url,
+                        "date": self.parse_date(bulletin.date),
+                        "content_hash": bulletin.content_hash,
+                        "row_count": len(bulletin.df),
+                    }
+                    for bulletin in bulletins
+                )
+                await TradingDailyRepository(async_session).refresh(dates)
+                await async_session.commit()
+                logger.info("Загружено бюллетеней: %s", len(bulletins))
+            except Exception:
+                await async_session.rollback()
+                logger.exception("Ошибка вставки данных: %s")
+                await self._record_failures(
+                    [bulletin.url for bulletin in bulletins], "load"
+                )
+                return
+
+        self.loaded_dates |= dates
+        await response_cache.invalidate(dates=dates)
 
-    # Переделать
-    @staticmethod
     @time_execution
     async def bulk_insert_data_to_db(
-        data_list: list[SpimexTradingResults],
+        self, async_session: AsyncSession, records: list[tuple]
     ) -> None:
-        """Вставляет результаты торгов в базу данных в пакетном режиме."""
-        if not data_list:
+        """Вставляет результаты торгов в базу данных в пакетном режиме.
+
+        Уже существующие строки (по дате и коду инструмента) не дублируются,
+        у них обновляется только `updated_on`, поэтому повторная загрузка
+        тех же бюллетеней безопасна.
+        """
+        if not records:
             logger.info("Нет данных для вставки.")
             return
 
+        # Один INSERT ... ON CONFLICT не может дважды обновить одну строку.
+        data_list = list(
+            {
+                (record[-1], record[0]): dict(
+                    zip(self.RECORD_COLUMNS, record, strict=True)
+                )
+                for record in records
+            }.values()
+        )
         batch_size = 3000
         total_records = len(data_list)
 
-        async with Session() as async_session:
-            try:
-                for i in range(0, total_records, batch_size):
-                    batch = data_list[i : i + batch_size]
-                    query = insert(SpimexTradingResults).values(
-                        [
-                            {
-                                "exchange_product_id": result.exchange_product_id,
-                                "exchange_product_name": result.exchange_product_name,
-                                "oil_id": result.oil_id,
-                                "delivery_basis_id": result.delivery_basis_id,
-                                "delivery_basis_name": result.delivery_basis_name,
-                                "delivery_type_id": result.delivery_type_id,
-                                "volume": result.volume,
-                                "total": result.total,
-                                "count": result.count,
-                                "date": result.date,
-                            }
-                            for result in batch
-                        ]
-                    )
-                    await async_session.execute(query)
-                    await async_session.commit()
-                    logger.info("Вставлено %s записей.", len(batch))
-            except Exception:
-                await async_session.rollback()
-                logger.exception("Ошибка вставки данных: %s")
+        for i in range(0, total_records, batch_size):
+            batch = data_list[i : i + batch_size]
+            query = insert(SpimexTradingResults).values(batch)
+            query = query.on_conflict_do_update(
+                constraint="uq_spimex_trading_results_date_exchange_product_id",
+                set_={"updated_on": func.timezone("utc", func.now())},
+            )
+            await async_session.execute(query)
+            logger.info("Вставлено %s записей.", len(batch))
+
+    @time_execution
+    async def copy_data_to_db(
+        self, async_session: AsyncSession, records: Iterable[tuple]
+    ) -> None:
+        """Загружает результаты торгов через COPY во временную таблицу.
+
+        Строки потоком передаются в staging-таблицу командой COPY (бинарный
+        протокол asyncpg), после чего одним запросом переносятся в
+        `spimex_trading_results` с той же семантикой upsert, что и у
+        `bulk_insert_data_to_db`: из повторов по (date, exchange_product_id)
+        остается последний. Транзакцией управляет вызывающий код.
+        """
+        columns = ", ".join(self.RECORD_COLUMNS)
+        await async_session.execute(
+            text(
+                f"CREATE TEMP TABLE {self.STAGING_TABLE} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM spimex_trading_results WITH NO DATA"
+            )
+        )
+        # Номер строки в порядке COPY, чтобы выбрать последний из повторов.
+        await async_session.execute(
+            text(
+                f"ALTER TABLE {self.STAGING_TABLE} "
+                "ADD COLUMN ordinal bigint GENERATED ALWAYS AS IDENTITY"
+            )
+        )
+
+        connection = await async_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        status = await raw_connection.driver_connection.copy_records_to_table(
+            self.STAGING_TABLE, records=records, columns=self.RECORD_COLUMNS
+        )
+        logger.info("Скопировано во временную таблицу: %s", status)
+
+        result = await async_session.execute(
+            text(
+                f"INSERT INTO spimex_trading_results ({columns}) "
+                f"SELECT DISTINCT ON (date, exchange_product_id) {columns} "
+                f"FROM {self.STAGING_TABLE} "
+                "ORDER BY date, exchange_product_id, ordinal DESC "
+                "ON CONFLICT ON CONSTRAINT "
+                "uq_spimex_trading_results_date_exchange_product_id "
+                "DO UPDATE SET updated_on = TIMEZONE('utc', now())"
+            )
+        )
+        logger.info("Вставлено %s записей.", result.rowcount)
 
-    def create_spimex_trading_results(
-        self, df: pd.DataFrame, date: str
-    ) -> list[SpimexTradingResults]:
-        """Создает список объектов SpimexTradingResults из DataFrame.
+    @staticmethod
+    def parse_date(value: str) -> date:
+        """Преобразует дату торгов из бюллетеня.
 
         Returns:
-            list[SpimexTradingResults]: Список созданных объектов.
+            date: Дата торгов.
 
         """
-        parsed_date = datetime.strptime(date, "%d.%m.%Y").astimezone().date()
-        return [
-            SpimexTradingResults(
-                exchange_product_id=row[self.INSTRUMENT_CODE_COL],
-                exchange_product_name=row[self.INSTRUMENT_NAME_COL],
-                oil_id=row[self.INSTRUMENT_CODE_COL][:4],
-                delivery_basis_id=row[self.INSTRUMENT_CODE_COL][4:7],
-                delivery_basis_name=row[self.DELIVERY_BASIS_COL],
-                delivery_type_id=row[self.INSTRUMENT_CODE_COL][-1],
-                volume=float(row[self.VOLUME_COL]),
-                total=float(row[self.TOTAL_COL]),
-                count=float(row[self.COUNT_COL]),
-                date=parsed_date,
+        return datetime.strptime(value, "%d.%m.%Y").astimezone().date()
+
+    def build_records(self, bulletins: list[Bulletin]) -> list[tuple]:
+        """Формирует записи для загрузки из DataFrame всех бюллетеней.
+
+        Бюллетени объединяются в один DataFrame, а идентификаторы и типы
+        колонок вычисляются векторно, без построчного обхода.
+
+        Returns:
+            list[tuple]: Кортежи значений в порядке `RECORD_COLUMNS`.
+
+        """
+        frames = [
+            bulletin.df.assign(date=self.parse_date(bulletin.date))
+            for bulletin in bulletins
+            if not bulletin.df.empty
+        ]
+        if not frames:
+            return []
+
+        df = pd.concat(frames, ignore_index=True)
+        code = df[self.INSTRUMENT_CODE_COL].astype(str)
+        columns = (
+            code,
+            code.str[:4],
+            code.str[4:7],
+            code.str[-1],
+            pd.to_numeric(df[self.VOLUME_COL]).astype(float),
+            pd.to_numeric(df[self.TOTAL_COL]).astype(float),
+            pd.to_numeric(df[self.COUNT_COL]).astype(float),
+            df["date"],
+        )
+        return list(zip(*(column.tolist() for column in columns), strict=True))
+
+    def build_dimensions(
+        self, bulletins: list[Bulletin]
+    ) -> tuple[list[dict], list[dict]]:
+        """Формирует строки справочников продуктов и базисов поставки.
+
+        Для каждого кода остается наименование из самого позднего бюллетеня
+        пачки вместе с его датой.
+
+        Returns:
+            tuple[list[dict], list[dict]]: Строки `spimex_products` и
+                `spimex_delivery_bases`.
+
+        """
+        frames = [
+            bulletin.df[list(self.TEXT_COLUMNS)].assign(
+                date=self.parse_date(bulletin.date)
             )
-            for _, row in df.iterrows()
+            for bulletin in bulletins
+            if not bulletin.df.empty
         ]
+        if not frames:
+            return [], []
+
+        df = pd.concat(frames, ignore_index=True).sort_values("date", kind="stable")
+        code = df[self.INSTRUMENT_CODE_COL].astype(str)
+        products = pd.DataFrame(
+            {
+                "exchange_product_id": code,
+                "exchange_product_name": df[self.INSTRUMENT_NAME_COL].astype(str),
+                "date": df["date"],
+            }
+        ).drop_duplicates("exchange_product_id", keep="last")
+        delivery_bases = pd.DataFrame(
+            {
+                "delivery_basis_id": code.str[4:7],
+                "delivery_basis_name": df[self.DELIVERY_BASIS_COL].astype(str),
+                "date": df["date"],
+            }
+        ).drop_duplicates("delivery_basis_id", keep="last")
+        return products.to_dict("records"), delivery_bases.to_dict("records")
+
+
+def decode_bulletins(contents: list[bytes]) -> list[DecodedBulletin | None]:
+    """Разбирает пачку XLS файлов, выполняется в процессе пула.
+
+    Ошибка разбора одного файла не прерывает пачку: формат бюллетеня задает
+    биржа, поэтому ловится любое исключение, а вместо результата
+    возвращается None.
+
+    Returns:
+        list[DecodedBulletin | None]: Разобранные бюллетени в исходном порядке.
+
+    """
+    parser = SpimexParser()
+    decoded = []
+    for content in contents:
+        try:
+            decoded.append(parser.decode_bulletin(content))
+        except Exception:
+            logger.exception("Не удалось разобрать бюллетень")
+            decoded.append(None)
+    return decoded
+
+
+async def archive_year(year: int) -> str:
+    """Отключает секцию года от итогов торгов и сбрасывает ответы за год.
+
+    Returns:
+        str: Имя таблицы с отключенными строками.
+
+    """
+    async with Session() as async_session:
+        name = await TradingPartitionsRepository(async_session).detach(year)
+        await async_session.commit()
+    start = date(year, 1, 1)
+    await response_cache.invalidate(
+        dates=[
+            start + timedelta(days=offset)
+            for offset in range((date(year + 1, 1, 1) - start).days)
+        ]
+    )
+    return name
+
+
+async def warm_up_cache() -> None:
+    """Заново вычисляет самые запрашиваемые ответы после загрузки.
+
+    Запросы отправляются в работающий API по `CACHE_WARMUP_API_URL`:
+    ответы строит и сохраняет в общий кэш сам API, а парсеру не нужно
+    импортировать веб-приложение.
+    """
+    async with httpx.AsyncClient(
+        base_url=settings.CACHE_WARMUP_API_URL,
+        timeout=settings.PARSER_HTTP_TIMEOUT,
+    ) as client:
+        await response_cache.warm_up(client, settings.CACHE_WARMUP_KEYS)
 
 
 async def main() -> None:
     """Основной метод запуска парсера."""
-    parser = SpimexParser()
-    await parser.parse()
+    arg_parser = argparse.ArgumentParser(description="Парсер итогов торгов СПбМТСБ.")
+    arg_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Обойти все страницы и перепроверить все бюллетени.",
+    )
+    arg_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Разобрать заново бюллетени из дискового кэша, не обращаясь к сети.",
+    )
+    arg_parser.add_argument(
+        "--archive",
+        type=int,
+        metavar="YEAR",
+        help="Отключить секцию года от таблицы итогов торгов вместо загрузки.",
+    )
+    args = arg_parser.parse_args()
+
+    redis = Redis.from_url(REDIS_URL)
+    response_cache.init(RedisCacheBackend(redis))
+    try:
+        if args.archive is not None:
+            try:
+                name = await archive_year(args.archive)
+            except LookupError as error:
+                arg_parser.error(str(error))
+            logger.info("Секция %s отключена в таблицу %s", args.archive, name)
+            return
+        parser = SpimexParser(incremental=not args.full, offline=args.offline)
+        await parser.parse()
+    finally:
+        await redis.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+from collections.abc import Iterable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.bulletin_failures import SpimexBulletinFailure
+from src.models.bulletins import SpimexBulletin
+
+
+class BulletinsRepository:
+    model = SpimexBulletin
+    failure_model = SpimexBulletinFailure
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_ingested(self) -> dict[str, str]:
+        """Возвращает хэши содержимого уже загруженных бюллетеней по их URL."""
+        result = await self.session.execute(
+            select(self.model.url, self.model.content_hash)
+        )
+        return dict(result.tuples().all())
+
+    async def get_failed(self) -> list[str]:
+        """Возвращает URL бюллетеней, которые не удалось загрузить ранее."""
+        result = await self.session.scalars(
+            select(self.failure_model.url).order_by(self.failure_model.created_on)
+        )
+        return list(result)
+
+    async def save(self, bulletins: Iterable[dict]) -> None:
+        """Добавляет бюллетени в журнал или обновляет существующие записи.
+
+        Загруженные бюллетени убираются из списка неудачных.
+        """
+        values = list(bulletins)
+        if not values:
+            return
+
+        query = insert(self.model).values(values)
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.url],
+            set_={
+                "date": query.excluded.date,
+                "content_hash": query.excluded.content_hash,
+                "row_count": query.excluded.row_count,
+                "updated_on": func.timezone("utc", func.now()),
+            },
+        )
+        await self.session.execute(query)
+        await self.session.execute(
+            delete(self.failure_model).where(
+                self.failure_model.url.in_([value["url"] for value in values])
+            )
+        )
+
+    async def save_failed(self, urls: Iterable[str], stage: str) -> None:
+        """Запоминает бюллетени, не дошедшие до журнала, и этап ошибки."""
+        values = [{"url": url, "stage": stage} for url in dict.fromkeys(urls)]
+        if not values:
+            return
+
+        query = insert(self.failure_model).values(values)
+        query = query.on_conflict_do_update(
+            index_elements=[self.failure_model.url],
+            set_={
+                "stage": query.excluded.stage,
+                "attempts": self.failure_model.attempts + 1,
+                "updated_on": func.timezone("utc", func.now()),
+            },
+        )
+        await self.session.execute(query)
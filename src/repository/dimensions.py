@@ -0,0 +1,37 @@
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.base import Base
+from src.models.delivery_bases import SpimexDeliveryBasis
+from src.models.products import SpimexProduct
+
+
+class DimensionsRepository:
+    product_model = SpimexProduct
+    delivery_basis_model = SpimexDeliveryBasis
+
+    batch_size = 3000
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def save(self, products: list[dict], delivery_bases: list[dict]) -> None:
+        """Добавляет в справочники новые коды и обновляет наименования.
+
+        Наименование заменяется, только если оно взято из бюллетеня не
+        старше того, из которого взято текущее.
+        """
+        await self._upsert(self.product_model, "exchange_product_name", products)
+        await self._upsert(
+            self.delivery_basis_model, "delivery_basis_name", delivery_bases
+        )
+
+    async def _upsert(self, model: type[Base], name: str, rows: list[dict]) -> None:
+        for i in range(0, len(rows), self.batch_size):
+            query = insert(model).values(rows[i : i + self.batch_size])
+            query = query.on_conflict_do_update(
+                index_elements=list(model.__table__.primary_key),
+                set_={name: query.excluded[name], "date": query.excluded.date},
+                where=model.date <= query.excluded.date,
+            )
+            await self.session.execute(query)
@@ -0,0 +1,57 @@
+from collections.abc import Collection
+from datetime import date
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.trading_daily import SpimexTradingDaily
+from src.models.trading_results import SpimexTradingResults
+
+
+class TradingDailyRepository:
+    model = SpimexTradingDaily
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def refresh(self, dates: Collection[date]) -> None:
+        """Пересчитывает дневные итоги за указанные даты по таблице итогов.
+
+        Вызывается в транзакции загрузки, поэтому итоги всегда согласованы
+        со строками `spimex_trading_results`.
+        """
+        if not dates:
+            return
+
+        source = SpimexTradingResults
+        dates = list(dates)
+        await self.session.execute(delete(self.model).where(self.model.date.in_(dates)))
+        await self.session.execute(
+            insert(self.model).from_select(
+                [
+                    "date",
+                    "oil_id",
+                    "delivery_basis_id",
+                    "delivery_type_id",
+                    "volume",
+                    "total",
+                    "count",
+                ],
+                select(
+                    source.date,
+                    source.oil_id,
+                    source.delivery_basis_id,
+                    source.delivery_type_id,
+                    func.sum(source.volume),
+                    func.sum(source.total),
+                    func.sum(source.count),
+                )
+                .where(source.date.in_(dates))
+                .group_by(
+                    source.date,
+                    source.oil_id,
+                    source.delivery_basis_id,
+                    source.delivery_type_id,
+                ),
+            )
+        )
@@ -0,0 +1,113 @@
+import re
+from collections.abc import Collection
+from datetime import UTC, date, datetime
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.bulletins import SpimexBulletin
+from src.models.trading_daily import SpimexTradingDaily
+from src.models.trading_results import SpimexTradingResults
+
+
+class TradingPartitionsRepository:
+    """Годовые секции таблицы `spimex_trading_results`.
+
+    Таблица секционирована по диапазону `date`: запросы с периодом читают
+    только секции нужных лет, а старый год отключается от таблицы без
+    удаления строк.
+    """
+
+    table = SpimexTradingResults.__tablename__
+    default = f"{table}_default"
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    @classmethod
+    def partition_name(cls, year: int) -> str:
+        return f"{cls.table}_y{year}"
+
+    async def get_years(self) -> set[int]:
+        """Возвращает годы, для которых уже есть секции.
+
+        Returns:
+            set[int]: Годы подключенных секций.
+
+        """
+        result = await self.session.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": self.table},
+        )
+        pattern = re.compile(rf"{self.table}_y(\d{{4}})")
+        return {int(match[1]) for name in result if (match := pattern.fullmatch(name))}
+
+    async def ensure(self, dates: Collection[date]) -> list[str]:
+        """Создает недостающие секции за годы `dates`.
+
+        Строки этих лет, уже попавшие в секцию по умолчанию, переносятся в
+        новую секцию до ее подключения. Вызывается в транзакции загрузки.
+
+        Returns:
+            list[str]: Имена созданных секций.
+
+        """
+        missing = sorted({value.year for value in dates} - await self.get_years())
+        created = []
+        for year in missing:
+            name = self.partition_name(year)
+            start, end = date(year, 1, 1), date(year + 1, 1, 1)
+            await self.session.execute(
+                text(f"CREATE TABLE {name} (LIKE {self.table} INCLUDING DEFAULTS)")
+            )
+            await self.session.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {self.default} "
+                    "WHERE date >= :start AND date < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                {"start": start, "end": end},
+            )
+            await self.session.execute(
+                text(
+                    f"ALTER TABLE {self.table} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                )
+            )
+            created.append(name)
+        return created
+
+    async def detach(self, year: int) -> str:
+        """Отключает секцию года от таблицы для архивации.
+
+        Строки остаются в отдельной таблице, которую можно выгрузить или
+        удалить, не трогая остальные годы. Таблица переименовывается, чтобы
+        год можно было загрузить заново, а дневные итоги и журнал бюллетеней
+        за этот год удаляются вместе с секцией.
+
+        Returns:
+            str: Имя отключенной таблицы.
+
+        Raises:
+            LookupError: Секции за этот год нет.
+
+        """
+        if year not in await self.get_years():
+            msg = f"Нет секции за {year} год"
+            raise LookupError(msg)
+        name = self.partition_name(year)
+        archive = f"{name}_detached_{datetime.now(UTC):%Y%m%d%H%M%S}"
+        start, end = date(year, 1, 1), date(year + 1, 1, 1)
+        await self.session.execute(
+            text(f"ALTER TABLE {self.table} DETACH PARTITION {name}")
+        )
+        await self.session.execute(text(f"ALTER TABLE {name} RENAME TO {archive}"))
+        for model in (SpimexTradingDaily, SpimexBulletin):
+            await self.session.execute(
+                delete(model).where(model.date >= start, model.date < end)
+            )
+        return archive
@@ -1,71 +1,192 @@
-from fastapi import Query
-from fastapi_cache.decorator import cache
-from sqlalchemy import Result, select
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import Date, Result, Row, Select, cast, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.filters.dynamics import DynamicsFilter
+from src.filters.aggregates import AggregatesFilter
+from src.filters.dynamics import DynamicsExportFilter, DynamicsFilter
 from src.filters.trading_results import TradingResultsFilter
+from src.models.base import Base
+from src.models.delivery_bases import SpimexDeliveryBasis
+from src.models.products import SpimexProduct
+from src.models.trading_daily import SpimexTradingDaily
 from src.models.trading_results import SpimexTradingResults
+from src.schemas.trading_results import TradingResult
+from src.utils.pagination import Page, decode_cursor, encode_cursor
 
 
 class TradingResultsRepository:
     model = SpimexTradingResults
+    daily_model = SpimexTradingDaily
+    product_model = SpimexProduct
+    delivery_basis_model = SpimexDeliveryBasis
+    # Только публичные колонки: без служебных created_on/updated_on.
+    columns = tuple(
+        SpimexTradingResults.__table__.c[name] for name in TradingResult.model_fields
+    )
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    @cache(expire=3600)
     async def get_last_trading_dates(self, days: int):
         """Возвращает список дат последних торговых дней,
         ограниченных указанным количеством дней.
+
+        Даты берутся из дневных итогов рекурсивным запросом: каждая следующая
+        дата находится одним спуском по первичному ключу, без чтения всех
+        строк за эти дни.
         """
-        stmt = (
-            select(self.model.date)
-            .distinct()
-            .order_by(self.model.date.desc())
-            .limit(days)
-        )
+        daily = self.daily_model
+        dates = select(func.max(daily.date).label("date")).cte("dates", recursive=True)
+        previous = select(
+            select(func.max(daily.date))
+            .where(daily.date < dates.c.date)
+            .scalar_subquery()
+        ).where(dates.c.date.is_not(None))
+        dates = dates.union_all(previous)
+
+        stmt = select(dates.c.date).where(dates.c.date.is_not(None)).limit(days)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def _build_query(self, data_filter) -> Query:
-        """Строит запрос на основе фильтров."""
-        query = select(self.model)
+    async def build_query(
+        self, data_filter, model: type[Base] | None = None, *, expand: bool = False
+    ) -> Select:
+        """Строит запрос публичных колонок на основе фильтров.
+
+        Строки результата не превращаются в ORM-объекты: ответы кодируются
+        прямо из них. С `expand` к строкам присоединяются наименования из
+        справочников продуктов и базисов поставки.
+        """
+        model = model or self.model
+        query = select(*(self.columns if model is self.model else model.__table__.c))
+
+        if expand:
+            product, basis = self.product_model, self.delivery_basis_model
+            query = (
+                query.add_columns(
+                    product.exchange_product_name, basis.delivery_basis_name
+                )
+                .outerjoin(
+                    product, product.exchange_product_id == model.exchange_product_id
+                )
+                .outerjoin(basis, basis.delivery_basis_id == model.delivery_basis_id)
+            )
 
         if data_filter.oil_id:
-            query = query.where(self.model.oil_id == data_filter.oil_id)
+            query = query.where(model.oil_id == data_filter.oil_id)
 
         if data_filter.delivery_type_id:
-            query = query.where(
-                self.model.delivery_type_id == data_filter.delivery_type_id
-            )
+            query = query.where(model.delivery_type_id == data_filter.delivery_type_id)
 
         if data_filter.delivery_basis_id:
             query = query.where(
-                self.model.delivery_basis_id == data_filter.delivery_basis_id
+                model.delivery_basis_id == data_filter.delivery_basis_id
             )
 
-        query = query.offset(data_filter.offset).limit(data_filter.limit)
-
         return query
 
-    @cache(expire=3600)
-    async def get_dynamics(self, data_filter: DynamicsFilter):
+    async def _get_page(
+        self, query: Select, data_filter, *, descending: bool = False
+    ) -> Page:
+        """Возвращает страницу запроса, продолжая с позиции курсора.
+
+        Страницы упорядочены по (date, id), а следующая начинается условием
+        `(date, id) > курсор`, а не OFFSET, поэтому время ответа не зависит
+        от номера страницы.
+
+        Returns:
+            Page: Строки страницы и курсор следующей, если она есть.
+
+        """
+        key = tuple_(self.model.date, self.model.id)
+        if data_filter.cursor:
+            position = tuple_(*decode_cursor(data_filter.cursor))
+            query = query.where(key < position if descending else key > position)
+
+        if descending:
+            query = query.order_by(self.model.date.desc(), self.model.id.desc())
+        else:
+            query = query.order_by(self.model.date, self.model.id)
+
+        # Лишняя строка показывает, есть ли следующая страница.
+        res: Result = await self.session.execute(query.limit(data_filter.per_page + 1))
+        rows = res.all()
+        if len(rows) <= data_filter.per_page:
+            return Page(results=rows)
+
+        rows = rows[: data_filter.per_page]
+        return Page(results=rows, next_cursor=encode_cursor(rows[-1].date, rows[-1].id))
+
+    async def get_dynamics(self, data_filter: DynamicsFilter) -> Page:
         """Возвращает динамику торгов за заданный период с учетом фильтров."""
         data_filter.validate()
-        query = await self._build_query(data_filter)
+        query = await self.build_query(data_filter, expand=data_filter.expand)
 
         query = query.where(self.model.date >= data_filter.start_date)
         query = query.where(self.model.date <= data_filter.end_date)
 
-        res: Result = await self.session.execute(query)
-        return res.scalars().all()
+        return await self._get_page(query, data_filter)
 
-    @cache(expire=3600)
-    async def get_trading_results(self, data_filter: TradingResultsFilter):
-        """Возвращает результаты последних торгов с учетом фильтров."""
-        query = await self._build_query(data_filter)
-        query = query.order_by(self.model.date.desc())
+    async def get_aggregates(self, data_filter: AggregatesFilter) -> list[dict]:
+        """Возвращает объем, сумму, количество договоров и VWAP за период.
 
+        Строки группируются по дню, неделе или месяцу и по выбранному
+        идентификатору; агрегаты считаются в БД по таблице дневных итогов.
+
+        Returns:
+            list[dict]: Агрегаты, упорядоченные по периоду и группе.
+
+        """
+        data_filter.validate()
+        daily = self.daily_model
+        period = cast(func.date_trunc(data_filter.period, daily.date), Date)
+        group = getattr(daily, data_filter.group_by)
+        volume = func.sum(daily.volume)
+        total = func.sum(daily.total)
+        query = (
+            (await self.build_query(data_filter, daily))
+            .with_only_columns(
+                period.label("period"),
+                group,
+                volume.label("volume"),
+                total.label("total"),
+                func.sum(daily.count).label("count"),
+                (total / func.nullif(volume, 0)).label("vwap"),
+            )
+            .where(daily.date >= data_filter.start_date)
+            .where(daily.date <= data_filter.end_date)
+            .group_by(period, group)
+            .order_by(period, group)
+        )
         res: Result = await self.session.execute(query)
-        return res.scalars().all()
+        return [row._asdict() for row in res]
+
+    async def stream_dynamics(
+        self, data_filter: DynamicsExportFilter, chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Отдает динамику торгов за период пачками строк без ORM-объектов.
+
+        Строки читаются серверным курсором, поэтому в памяти одновременно
+        находится не больше `chunk_size` строк.
+
+        Yields:
+            Sequence[Row]: Пачка строк с колонками таблицы.
+
+        """
+        data_filter.validate()
+        query = (
+            (await self.build_query(data_filter, expand=data_filter.expand))
+            .where(self.model.date >= data_filter.start_date)
+            .where(self.model.date <= data_filter.end_date)
+            .order_by(self.model.date, self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for rows in result.partitions():
+            yield rows
+
+    async def get_trading_results(self, data_filter: TradingResultsFilter) -> Page:
+        """Возвращает результаты последних торгов с учетом фильтров."""
+        query = await self.build_query(data_filter, expand=data_filter.expand)
+        return await self._get_page(query, data_filter, descending=True)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from src.utils.cache import response_cache
+
+router = APIRouter(tags=["Cache"])
+
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Счетчики попаданий и промахов кэша ответов в этом процессе."""
+    return response_cache.stats()
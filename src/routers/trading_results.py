@@ -1,44 +1,171 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import date
+from typing import Any, Literal
 
-from src.database.db import Session
-from src.filters.dynamics import DynamicsFilter
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
+
+from src.database.db import read_sessions
+from src.database.replicas import ReplicaRouter
+from src.filters.aggregates import AggregatesFilter
+from src.filters.dynamics import DynamicsExportFilter, DynamicsFilter
 from src.filters.trading_results import TradingResultsFilter
 from src.repository.trading_results import TradingResultsRepository
+from src.schemas.trading_results import (
+    Aggregate,
+    ExpandedTradingResult,
+    TradingResult,
+    TradingResultsPage,
+)
+from src.settings.config import settings
+from src.utils.cache import response_cache
+from src.utils.export import EXPORT_FORMATS
+from src.utils.formats import TABLE_FORMATS, ResponseFormat, negotiate
 
 router = APIRouter(tags=["Trading Results"])
 
 
-async def get_db() -> AsyncSession:
-    async with Session() as session:
-        yield session
+def get_read_sessions() -> ReplicaRouter:
+    """Маршрутизатор чтения между репликами и primary.
+
+    Фабрика сессий выбирается только при промахе кэша, в `query`.
+    """
+    return read_sessions
+
+
+async def query(
+    sessions: ReplicaRouter,
+    fetch: Callable[[TradingResultsRepository], Awaitable[Any]],
+) -> Any:
+    """Выполняет запрос репозитория в отдельной сессии.
+
+    Соединение возвращается в пул сразу после чтения данных, до кодирования
+    и записи ответа в кэш. Сразу после загрузки данных запрос идет в primary:
+    ответ отстающей реплики без новых данных попал бы в кэш на весь TTL.
+
+    Returns:
+        Any: Результат `fetch`.
+
+    """
+    if sessions.healthy and await response_cache.recently_written():
+        factory = sessions.primary
+    else:
+        factory = sessions.choose()
+    async with factory() as session:
+        return await fetch(TradingResultsRepository(session=session))
+
+
+def get_table_format(accept: str | None = Header(None)) -> ResponseFormat:
+    """Формат ответа со строками таблицы: JSON, Arrow IPC stream или Parquet."""
+    return negotiate(accept, TABLE_FORMATS)
+
 
+# Ответы кодируются заранее и возвращаются как Response, поэтому
+# response_model не валидирует их, а только описывает схему в OpenAPI.
+TABLE_RESPONSES = {
+    200: {
+        "content": {
+            response_format.media_type: {}
+            for response_format in TABLE_FORMATS
+            if response_format.media_type != "application/json"
+        }
+    }
+}
 
-@router.get("/last_trading_dates")
-async def get_last_trading_dates(days: int, session: AsyncSession = Depends(get_db)):
+
+@router.get("/last_trading_dates", response_model=list[date])
+async def get_last_trading_dates(
+    days: int,
+    sessions: ReplicaRouter = Depends(get_read_sessions),
+) -> Response:
     """Получение последних торговых дат."""
-    return await TradingResultsRepository(session=session).get_last_trading_dates(
-        days=days
+    return await response_cache.respond(
+        "last_trading_dates",
+        {"days": days},
+        lambda: query(sessions, lambda repo: repo.get_last_trading_dates(days=days)),
     )
 
 
-@router.get("/dynamics")
+@router.get("/dynamics", response_model=TradingResultsPage, responses=TABLE_RESPONSES)
 async def get_dynamics(
     data_filter: DynamicsFilter = Depends(DynamicsFilter),
-    session: AsyncSession = Depends(get_db),
-):
+    response_format: ResponseFormat = Depends(get_table_format),
+    sessions: ReplicaRouter = Depends(get_read_sessions),
+) -> Response:
     """Получение динамики торгов за заданный период."""
-    return await TradingResultsRepository(session=session).get_dynamics(
-        data_filter=data_filter
+    return await response_cache.respond(
+        "dynamics",
+        data_filter,
+        lambda: query(
+            sessions, lambda repo: repo.get_dynamics(data_filter=data_filter)
+        ),
+        response_format,
+    )
+
+
+@router.get("/aggregates", response_model=list[Aggregate])
+async def get_aggregates(
+    data_filter: AggregatesFilter = Depends(AggregatesFilter),
+    sessions: ReplicaRouter = Depends(get_read_sessions),
+) -> Response:
+    """Получение агрегированной динамики торгов по дням, неделям или месяцам."""
+    return await response_cache.respond(
+        "aggregates",
+        data_filter,
+        lambda: query(
+            sessions, lambda repo: repo.get_aggregates(data_filter=data_filter)
+        ),
+    )
+
+
+@router.get("/dynamics/export")
+async def export_dynamics(
+    data_filter: DynamicsExportFilter = Depends(DynamicsExportFilter),
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    sessions: ReplicaRouter = Depends(get_read_sessions),
+) -> StreamingResponse:
+    """Потоковая выгрузка динамики торгов за период в NDJSON или CSV."""
+    data_filter.validate()
+    media_type, encode = EXPORT_FORMATS[export_format]
+    schema = ExpandedTradingResult if data_filter.expand else TradingResult
+    columns = list(schema.model_fields)
+
+    async def stream() -> AsyncIterator[bytes]:
+        # Сессия открывается в самом потоке и живет до конца выгрузки.
+        async with sessions.choose()() as session:
+            chunks = TradingResultsRepository(session=session).stream_dynamics(
+                data_filter, settings.EXPORT_CHUNK_SIZE
+            )
+            header = True
+            async for rows in chunks:
+                yield encode(columns, rows, header=header)
+                header = False
+        if header:
+            yield encode(columns, [], header=header)
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="dynamics.{export_format}"'
+        },
     )
 
 
-@router.get("/trading_results")
+@router.get(
+    "/trading_results", response_model=TradingResultsPage, responses=TABLE_RESPONSES
+)
 async def get_trading_results(
     data_filter: TradingResultsFilter = Depends(TradingResultsFilter),
-    session: AsyncSession = Depends(get_db),
-):
+    response_format: ResponseFormat = Depends(get_table_format),
+    sessions: ReplicaRouter = Depends(get_read_sessions),
+) -> Response:
     """Получение результатов последних торгов."""
-    return await TradingResultsRepository(session=session).get_trading_results(
-        data_filter=data_filter
+    return await response_cache.respond(
+        "trading_results",
+        data_filter,
+        lambda: query(
+            sessions, lambda repo: repo.get_trading_results(data_filter=data_filter)
+        ),
+        response_format,
     )
@@ -0,0 +1,13 @@
+__all__ = [
+    "Aggregate",
+    "ExpandedTradingResult",
+    "TradingResult",
+    "TradingResultsPage",
+]
+
+from src.schemas.trading_results import (
+    Aggregate,
+    ExpandedTradingResult,
+    TradingResult,
+    TradingResultsPage,
+)
@@ -0,0 +1,49 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class TradingResult(BaseModel):
+    """Публичные колонки строки итогов торгов.
+
+    Репозиторий выбирает из БД ровно эти поля, служебные `created_on` и
+    `updated_on` в ответ не попадают.
+    """
+
+    id: int
+    exchange_product_id: str
+    oil_id: str
+    delivery_basis_id: str
+    delivery_type_id: str
+    volume: float
+    total: float
+    count: float
+    date: date
+
+
+class ExpandedTradingResult(TradingResult):
+    """Строка итогов торгов с наименованиями из справочников (`expand=true`).
+
+    Наименование пусто, если код еще не попал в справочник.
+    """
+
+    exchange_product_name: str | None
+    delivery_basis_name: str | None
+
+
+class TradingResultsPage(BaseModel):
+    results: list[TradingResult | ExpandedTradingResult]
+    next_cursor: str | None = None
+
+
+class Aggregate(BaseModel):
+    """Итоги за период по группе; заполнено одно поле, выбранное в `group_by`."""
+
+    period: date
+    oil_id: str | None = None
+    delivery_basis_id: str | None = None
+    delivery_type_id: str | None = None
+    volume: float
+    total: float
+    count: float
+    vwap: float | None
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -15,6 +17,42 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     WEB_PORT: str
 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_MAX_LAG: float = 10
+    DB_REPLICA_CHECK_INTERVAL: float = 5
+
+    PARSER_LOADER: Literal["copy", "insert"] = "copy"
+    PARSER_WORKERS: int | None = None
+    PARSER_CHUNK_SIZE: int = 8
+    PARSER_QUEUE_SIZE: int = 16
+    PARSER_HTTP_LIMIT: int = 20
+    PARSER_HTTP_CONCURRENCY: int = 10
+    PARSER_HTTP_TIMEOUT: float = 30
+    PARSER_HTTP_RETRIES: int = 3
+    PARSER_HTTP_BACKOFF: float = 0.5
+    PARSER_CACHE_DIR: str | None = ".cache/bulletins"
+    PARSER_CACHE_MAX_BYTES: int = 1024**3
+
+    CACHE_WARMUP_KEYS: int = 50
+    CACHE_WARMUP_API_URL: str = "http://localhost:8000/api"
+    # Запас сверх CACHE_WARMUP_KEYS; рейтинг обрезается до этого размера,
+    # когда в нем вдвое больше ключей, чтобы новые ключи успевали набрать вес.
+    CACHE_RANKING_SIZE: int = 1000
+    CACHE_LOCAL_MAX_ENTRIES: int = 1000
+    CACHE_LOCAL_TTL: float = 5
+    CACHE_STALE_TTL: float = 0
+    API_MAX_PAGE_SIZE: int = 1000
+    EXPORT_CHUNK_SIZE: int = 5000
+    METRICS_SLOW_QUERY_MS: float | None = None
+    # Значения параметров в логе медленных запросов, только для отладки.
+    METRICS_SLOW_QUERY_PARAMETERS: bool = False
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
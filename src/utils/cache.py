@@ -1,18 +1,503 @@
+import asyncio
+import fnmatch
 import logging
+import math
+import time
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection
+from dataclasses import asdict, is_dataclass
+from datetime import date
+from typing import Any, Protocol
+from urllib.parse import parse_qsl, urlencode
 
+import httpx
+from fastapi import Response
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
-from src.settings.config import REDIS_URL
-from src.utils.exceptions import CacheError
+from src.settings.config import settings
+from src.utils.formats import FORMATS, JSON, ResponseFormat
+from src.utils.metrics import CACHE_OPERATION_DURATION, CACHE_REQUESTS
 
 logger = logging.getLogger(__name__)
 
 
-async def clear_cache():
-    """Полная очистка кэша Redis."""
-    redis = Redis.from_url(REDIS_URL)
-    try:
-        await redis.flushall()
-        logger.info("Кэш успешно очищен.")
-    except CacheError:
-        logger.exception("Ошибка при очистке кэша:")
+class CacheBackend(Protocol):
+    async def get(self, key: str, ranking: str | None = None) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, expire: int) -> None: ...
+
+    async def delete(self, keys: list[str]) -> None: ...
+
+    def scan(self, pattern: str) -> AsyncIterator[str]: ...
+
+    async def top(self, ranking: str, limit: int) -> list[str]: ...
+
+
+class RedisCacheBackend:
+    """Хранение ответов в Redis.
+
+    Рейтинг обращений ограничен: каждая страница курсора — отдельный ключ,
+    и без обрезки рейтинг рос бы без ограничений. Когда в нем набирается
+    больше `2 * ranking_size` ключей, остаются `ranking_size` самых частых.
+    Запас нужен, чтобы новый ключ успел набрать вес до следующей обрезки,
+    а не вытеснялся тем же обращением, которым попал в рейтинг.
+    """
+
+    def __init__(
+        self, redis: Redis, ranking_size: int = settings.CACHE_RANKING_SIZE
+    ) -> None:
+        self.redis = redis
+        self.ranking_size = ranking_size
+
+    async def get(self, key: str, ranking: str | None = None) -> bytes | None:
+        """Читает значение и, если задан `ranking`, учитывает обращение к ключу.
+
+        Returns:
+            bytes | None: Сохраненное значение.
+
+        """
+        if ranking is None:
+            return await self.redis.get(key)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            value, _, size = (
+                await pipe.get(key).zincrby(ranking, 1, key).zcard(ranking).execute()
+            )
+        if size > 2 * self.ranking_size:
+            await self.redis.zremrangebyrank(ranking, 0, -self.ranking_size - 1)
+        return value
+
+    async def set(self, key: str, value: bytes, expire: int) -> None:
+        await self.redis.set(key, value, ex=expire)
+
+    async def delete(self, keys: list[str]) -> None:
+        if keys:
+            await self.redis.unlink(*keys)
+
+    async def scan(self, pattern: str) -> AsyncIterator[str]:
+        async for key in self.redis.scan_iter(match=pattern, count=1000):
+            yield key.decode()
+
+    async def top(self, ranking: str, limit: int) -> list[str]:
+        keys = await self.redis.zrevrange(ranking, 0, limit - 1)
+        return [key.decode() for key in keys]
+
+
+class InMemoryCacheBackend:
+    """Хранение ответов в памяти процесса, используется в тестах."""
+
+    def __init__(self, ranking_size: int = settings.CACHE_RANKING_SIZE) -> None:
+        self.values: dict[str, tuple[bytes, float]] = {}
+        self.rankings: dict[str, Counter[str]] = {}
+        self.ranking_size = ranking_size
+
+    async def get(self, key: str, ranking: str | None = None) -> bytes | None:
+        if ranking is not None:
+            counter = self.rankings.setdefault(ranking, Counter())
+            counter[key] += 1
+            if len(counter) > 2 * self.ranking_size:
+                self.rankings[ranking] = Counter(
+                    dict(counter.most_common(self.ranking_size))
+                )
+        value, expires_at = self.values.get(key, (None, 0))
+        return value if expires_at > time.monotonic() else None
+
+    async def set(self, key: str, value: bytes, expire: int) -> None:
+        self.values[key] = (value, time.monotonic() + expire)
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def scan(self, pattern: str) -> AsyncIterator[str]:
+        for key in list(self.values):
+            if fnmatch.fnmatchcase(key, pattern):
+                yield key
+
+    async def top(self, ranking: str, limit: int) -> list[str]:
+        counter = self.rankings.get(ranking, Counter())
+        return [key for key, _ in counter.most_common(limit)]
+
+
+class LocalCache:
+    """Ограниченный LRU-кэш ответов в памяти процесса с TTL.
+
+    После истечения TTL запись еще `stale_ttl` секунд хранится как
+    устаревшая: ее можно отдать, пока другой запрос вычисляет свежую.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, stale_ttl: float = 0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bytes, bool] | None:
+        """Читает запись и отмечает ее недавно использованной.
+
+        Returns:
+            tuple[bytes, bool] | None: Значение и признак того, что оно свежее.
+
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, fresh_until = entry
+        now = time.monotonic()
+        if now >= fresh_until + self.stale_ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value, now < fresh_until
+
+    def set(self, key: str, value: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (value, time.monotonic() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def expire(self, keys: Collection[str]) -> None:
+        """Помечает записи устаревшими, не удаляя их раньше `stale_ttl`."""
+        now = time.monotonic()
+        for key in keys:
+            if key in self.entries:
+                self.entries[key] = (self.entries[key][0], now)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class ResponseCache:
+    """Кэш готовых ответов эндпоинтов.
+
+    Ключ строится только из пространства имен эндпоинта и нормализованных
+    параметров фильтра, а в хранилище лежат уже сериализованные байты ответа,
+    поэтому попадание в кэш не требует ни БД, ни повторной сериализации.
+
+    Параметры хранятся в ключе в виде строки запроса, поэтому по ключу можно
+    понять, какой период он покрывает, и повторить запрос при прогреве.
+
+    Перед общим хранилищем стоит локальный кэш процесса с коротким TTL, а
+    промахи по одному ключу объединяются: ответ вычисляет только первый
+    запрос, остальные ждут его результата.
+
+    Инвалидация оставляет в хранилище отметку о записи на `write_window`
+    секунд: пока она есть, реплики могут еще не видеть новых данных, и
+    промахи читаются из primary (см. `recently_written`).
+    """
+
+    def __init__(
+        self,
+        prefix: str = "trading-results",
+        expire: int = 3600,
+        local_max_entries: int = 1000,
+        local_ttl: float = 5,
+        stale_ttl: float = 0,
+        write_window: float = 0,
+    ) -> None:
+        self.prefix = prefix
+        self.expire = expire
+        self.ranking = f"{prefix}:ranking"
+        self.written = f"{prefix}:written"
+        self.write_window = write_window
+        self.backend: CacheBackend | None = None
+        self.local = LocalCache(local_max_entries, local_ttl, stale_ttl)
+        self.inflight: dict[str, asyncio.Future[bytes]] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def init(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.local.clear()
+        self.inflight.clear()
+        self.hits.clear()
+        self.misses.clear()
+
+    def make_key(
+        self, namespace: str, params: Any, response_format: ResponseFormat = JSON
+    ) -> str:
+        """Строит детерминированный ключ по параметрам запроса.
+
+        Формат ответа, кроме JSON, хранится в ключе параметром `format`.
+
+        Returns:
+            str: Ключ вида `<prefix>:<namespace>:<отсортированные параметры>`.
+
+        """
+        if is_dataclass(params):
+            params = asdict(params)
+        if response_format is not JSON:
+            params = {**params, "format": response_format.name}
+        query = urlencode(
+            sorted(
+                (name, value.isoformat() if isinstance(value, date) else value)
+                for name, value in params.items()
+                if value is not None
+            )
+        )
+        return f"{self.prefix}:{namespace}:{query}"
+
+    def parse_key(self, key: str) -> tuple[str, dict[str, str]]:
+        """Разбирает ключ кэша обратно на пространство имен и параметры.
+
+        Returns:
+            tuple[str, dict[str, str]]: Пространство имен и параметры запроса.
+
+        """
+        namespace, _, query = key.removeprefix(f"{self.prefix}:").partition(":")
+        return namespace, dict(parse_qsl(query))
+
+    async def respond(
+        self,
+        namespace: str,
+        params: Any,
+        compute: Callable[[], Awaitable[Any]],
+        response_format: ResponseFormat = JSON,
+    ) -> Response:
+        """Возвращает ответ из кэша или вычисляет и кэширует его.
+
+        Порядок поиска: локальный кэш, ответ, который уже вычисляет другой
+        запрос, общее хранилище и только затем `compute`.
+
+        Returns:
+            Response: Ответ в `response_format` с заголовком
+                `X-Cache: HIT|MISS|STALE`.
+
+        """
+        if self.backend is None:
+            content = response_format.encode(await compute())
+            return self.make_response(content, response_format, "BYPASS")
+
+        key = self.make_key(namespace, params, response_format)
+        local = self.local.get(key)
+        if local is not None and local[1]:
+            self.hits[namespace] += 1
+            CACHE_REQUESTS.labels(namespace, "local_hit").inc()
+            return self.make_response(local[0], response_format, "HIT")
+
+        while (future := self.inflight.get(key)) is not None:
+            if local is not None:
+                self.hits[namespace] += 1
+                CACHE_REQUESTS.labels(namespace, "stale").inc()
+                return self.make_response(local[0], response_format, "STALE")
+            try:
+                content = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Вычислявший запрос отменен: повторяем попытку сами.
+                if not future.cancelled():
+                    raise
+                continue
+            self.hits[namespace] += 1
+            CACHE_REQUESTS.labels(namespace, "coalesced").inc()
+            return self.make_response(content, response_format, "HIT")
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            content, status = await self.load(namespace, key, compute, response_format)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Исключение получат ожидающие запросы, если они есть.
+            future.exception()
+            raise
+        else:
+            self.local.set(key, content)
+            future.set_result(content)
+        finally:
+            del self.inflight[key]
+        return self.make_response(content, response_format, status)
+
+    async def load(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        response_format: ResponseFormat,
+    ) -> tuple[bytes, str]:
+        """Читает ответ из общего хранилища или вычисляет и сохраняет его.
+
+        Returns:
+            tuple[bytes, str]: Ответ и значение заголовка `X-Cache`.
+
+        """
+        try:
+            with CACHE_OPERATION_DURATION.labels("get").time():
+                content = await self.backend.get(key, self.ranking)
+        except RedisError:
+            logger.exception("Ошибка чтения кэша %s", key)
+            CACHE_REQUESTS.labels(namespace, "error").inc()
+            content = None
+
+        if content is not None:
+            self.hits[namespace] += 1
+            CACHE_REQUESTS.labels(namespace, "hit").inc()
+            return content, "HIT"
+
+        self.misses[namespace] += 1
+        CACHE_REQUESTS.labels(namespace, "miss").inc()
+        content = response_format.encode(await compute())
+        try:
+            with CACHE_OPERATION_DURATION.labels("set").time():
+                await self.backend.set(key, content, self.expire)
+        except RedisError:
+            logger.exception("Ошибка записи кэша %s", key)
+        return content, "MISS"
+
+    @staticmethod
+    def make_response(
+        content: bytes, response_format: ResponseFormat, status: str
+    ) -> Response:
+        return Response(
+            content=content,
+            media_type=response_format.media_type,
+            headers={"X-Cache": status, "Vary": "Accept"},
+        )
+
+    async def invalidate(
+        self, namespace: str = "*", dates: Collection[date] | None = None
+    ) -> int:
+        """Удаляет ключи пространства имен, затронутые новыми датами торгов.
+
+        Ключи с периодом `start_date`–`end_date`, в который не попадает ни
+        одна из `dates`, остаются в кэше. Ключи без периода зависят от
+        последних данных и удаляются всегда. В локальном кэше этого процесса
+        такие ключи помечаются устаревшими, в других процессах они истекут
+        по TTL локального кэша.
+
+        Отметка о записи ставится до удаления ключей, чтобы ни один промах
+        после удаления не попал на отстающую реплику.
+
+        Returns:
+            int: Количество удаленных ключей.
+
+        """
+        if self.backend is None:
+            return 0
+
+        self.local.expire(
+            [
+                key
+                for key in self.local.entries
+                if fnmatch.fnmatchcase(key, f"{self.prefix}:{namespace}:*")
+                and (dates is None or self.is_affected(key, dates))
+            ]
+        )
+        try:
+            if self.write_window > 0:
+                await self.backend.set(self.written, b"1", math.ceil(self.write_window))
+            keys = [
+                key
+                async for key in self.backend.scan(f"{self.prefix}:{namespace}:*")
+                if dates is None or self.is_affected(key, dates)
+            ]
+            await self.backend.delete(keys)
+        except RedisError:
+            logger.exception("Ошибка инвалидации кэша %s", namespace)
+            return 0
+        logger.info("Удалено ключей кэша: %s", len(keys))
+        return len(keys)
+
+    async def recently_written(self) -> bool:
+        """Проверяет, были ли данные изменены меньше `write_window` секунд назад.
+
+        Returns:
+            bool: True, если реплики могут еще не видеть последнюю запись.
+
+        """
+        if self.backend is None or self.write_window <= 0:
+            return False
+        try:
+            return await self.backend.get(self.written) is not None
+        except RedisError:
+            # Без хранилища ответ все равно не попадет в общий кэш.
+            logger.exception("Ошибка чтения отметки о записи")
+            return False
+
+    def is_affected(self, key: str, dates: Collection[date]) -> bool:
+        """Проверяет, попадает ли одна из дат в период, закэшированный ключом.
+
+        Returns:
+            bool: True, если ответ по ключу мог измениться.
+
+        """
+        _, params = self.parse_key(key)
+        if "start_date" not in params or "end_date" not in params:
+            return True
+        start_date = date.fromisoformat(params["start_date"])
+        end_date = date.fromisoformat(params["end_date"])
+        return any(start_date <= value <= end_date for value in dates)
+
+    async def warm_up(self, client: httpx.AsyncClient, limit: int) -> int:
+        """Заново вычисляет самые запрашиваемые ключи, которых нет в кэше.
+
+        Запросы повторяются через `client`, поэтому ответы строятся тем же
+        кодом эндпоинтов, что и при обычном промахе. Прогрев выполняется уже
+        после фиксации данных, поэтому ошибка на одном ключе только пишется
+        в лог и не прерывает остальные.
+
+        Returns:
+            int: Количество прогретых ключей.
+
+        """
+        if self.backend is None or limit <= 0:
+            return 0
+
+        try:
+            keys = await self.backend.top(self.ranking, limit)
+        except RedisError:
+            logger.exception("Ошибка чтения рейтинга кэша")
+            return 0
+
+        warmed = 0
+        for key in keys:
+            try:
+                warmed += await self.warm_up_key(client, key)
+            except Exception:
+                logger.exception("Не удалось прогреть %s", key)
+        logger.info("Прогрето ключей кэша: %s", warmed)
+        return warmed
+
+    async def warm_up_key(self, client: httpx.AsyncClient, key: str) -> bool:
+        """Повторяет запрос ключа, если ответа нет в кэше.
+
+        Returns:
+            bool: True, если ответ вычислен заново.
+
+        """
+        if await self.backend.get(key) is not None:
+            return False
+        namespace, params = self.parse_key(key)
+        response_format = FORMATS[params.pop("format", JSON.name)]
+        response = await client.get(
+            f"/{namespace}",
+            params=params,
+            headers={"Accept": response_format.media_type},
+        )
+        if not response.is_success:
+            logger.warning("Не удалось прогреть %s: %s", key, response.status_code)
+        return response.is_success
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Возвращает счетчики попаданий и промахов по пространствам имен."""
+        return {
+            namespace: {
+                "hits": self.hits[namespace],
+                "misses": self.misses[namespace],
+            }
+            for namespace in sorted(self.hits.keys() | self.misses.keys())
+        }
+
+
+response_cache = ResponseCache(
+    local_max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+    local_ttl=settings.CACHE_LOCAL_TTL,
+    stale_ttl=settings.CACHE_STALE_TTL,
+    # Реплика отстает не больше чем на DB_REPLICA_MAX_LAG на момент проверки
+    # и может отстать сильнее до следующей.
+    write_window=settings.DB_REPLICA_MAX_LAG + settings.DB_REPLICA_CHECK_INTERVAL,
+)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Self
+
+from src.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheMissError(LookupError):
+    """Файла нет в кэше или его содержимое недоступно."""
+
+
+@dataclass
+class CacheEntry:
+    """Запись индекса кэша для одного URL."""
+
+    blob: str
+    size: int
+    accessed: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def validators(self) -> dict[str, str]:
+        """Заголовки условного GET-запроса для ревалидации записи.
+
+        Returns:
+            dict[str, str]: Заголовки If-None-Match и If-Modified-Since.
+
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DownloadCache:
+    """Дисковый кэш скачанных файлов.
+
+    Содержимое хранится в `blobs/` под своим sha256, а `index.json` связывает
+    URL с хэшем содержимого и валидаторами ETag/Last-Modified. При превышении
+    `max_bytes` удаляются давно не использованные записи.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = directory / "index.json"
+        self.entries: dict[str, CacheEntry] = {}
+        if self.index_path.exists():
+            self.entries = {
+                url: CacheEntry(**entry)
+                for url, entry in json.loads(self.index_path.read_text()).items()
+            }
+
+    @classmethod
+    def from_settings(cls) -> Self | None:
+        if not settings.PARSER_CACHE_DIR:
+            return None
+        return cls(Path(settings.PARSER_CACHE_DIR), settings.PARSER_CACHE_MAX_BYTES)
+
+    def urls(self) -> list[str]:
+        """Возвращает URL всех закэшированных файлов."""
+        return list(self.entries)
+
+    def get(self, url: str) -> CacheEntry | None:
+        return self.entries.get(url)
+
+    def read(self, url: str) -> bytes:
+        """Читает закэшированное содержимое и отмечает запись использованной.
+
+        Если файл содержимого удален или не читается, запись убирается из
+        индекса и чтение считается промахом.
+
+        Returns:
+            bytes: Содержимое файла.
+
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            raise CacheMissError(url)
+        try:
+            content = self._blob_path(entry.blob).read_bytes()
+        except OSError:
+            logger.warning("Файл кэша для %s недоступен", url, exc_info=True)
+            del self.entries[url]
+            raise CacheMissError(url) from None
+        entry.accessed = time.time()
+        return content
+
+    def put(
+        self,
+        url: str,
+        content: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Сохраняет содержимое и валидаторы, затем освобождает место."""
+        blob = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(blob)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(path)
+
+        previous = self.entries.get(url)
+        self.entries[url] = CacheEntry(
+            blob=blob,
+            size=len(content),
+            accessed=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        if previous and previous.blob != blob:
+            self._remove_blob(previous.blob)
+        self.evict()
+
+    def evict(self) -> None:
+        """Удаляет давно не использованные записи сверх `max_bytes`."""
+        total = sum(entry.size for entry in self.entries.values())
+        for url, entry in sorted(self.entries.items(), key=lambda x: x[1].accessed):
+            if total <= self.max_bytes:
+                break
+            del self.entries[url]
+            self._remove_blob(entry.blob)
+            total -= entry.size
+            logger.info("Удален из кэша: %s", url)
+
+    def save(self) -> None:
+        """Атомарно записывает индекс на диск."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({url: asdict(entry) for url, entry in self.entries.items()})
+        )
+        tmp_path.replace(self.index_path)
+
+    def _blob_path(self, blob: str) -> Path:
+        return self.directory / "blobs" / blob[:2] / blob
+
+    def _remove_blob(self, blob: str) -> None:
+        if any(entry.blob == blob for entry in self.entries.values()):
+            return
+        self._blob_path(blob).unlink(missing_ok=True)
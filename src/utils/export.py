@@ -0,0 +1,45 @@
+import csv
+import io
+from collections.abc import Sequence
+
+import orjson
+from sqlalchemy import Row
+
+
+def encode_ndjson(
+    columns: Sequence[str], rows: Sequence[Row], *, header: bool
+) -> bytes:
+    """Кодирует пачку строк в NDJSON, по одному объекту на строку.
+
+    Returns:
+        bytes: Закодированная пачка.
+
+    """
+    return b"".join(
+        orjson.dumps(
+            dict(zip(columns, row, strict=True)), option=orjson.OPT_APPEND_NEWLINE
+        )
+        for row in rows
+    )
+
+
+def encode_csv(columns: Sequence[str], rows: Sequence[Row], *, header: bool) -> bytes:
+    """Кодирует пачку строк в CSV, заголовок пишется только в первой пачке.
+
+    Returns:
+        bytes: Закодированная пачка.
+
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+# Формат выгрузки: MIME-тип ответа и функция кодирования пачки строк.
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", encode_ndjson),
+    "csv": ("text/csv", encode_csv),
+}
@@ -0,0 +1,218 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date
+from functools import cache
+from importlib.util import find_spec
+from io import BytesIO
+from typing import Any
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import Row
+
+from src.models.base import Base
+from src.schemas.trading_results import ExpandedTradingResult, TradingResult
+from src.utils.pagination import Page
+
+if find_spec("pyarrow"):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+else:
+    pa = pq = None
+
+
+def serialize_default(value: Any) -> Any:
+    """Преобразует строки результата и модели SQLAlchemy для orjson.
+
+    Returns:
+        Any: Словарь колонок строки.
+
+    """
+    if isinstance(value, Row):
+        return value._asdict()
+    if isinstance(value, Base):
+        return {
+            column.key: getattr(value, column.key) for column in value.__table__.columns
+        }
+    raise TypeError
+
+
+def encode_json(value: Any) -> bytes:
+    """Кодирует ответ в JSON через orjson.
+
+    Строки страницы заранее превращаются в словари одним проходом, чтобы
+    orjson не вызывал `default` для каждой строки.
+
+    Returns:
+        bytes: JSON-документ.
+
+    """
+    if isinstance(value, Page):
+        fields = value.results[0]._fields if value.results else ()
+        value = {
+            "results": [dict(zip(fields, row, strict=True)) for row in value.results],
+            "next_cursor": value.next_cursor,
+        }
+    return orjson.dumps(value, default=serialize_default)
+
+
+@cache
+def trading_results_schema(fields: tuple[str, ...]) -> "pa.Schema":
+    """Схема Arrow для колонок итогов торгов, в том числе наименований.
+
+    Returns:
+        pa.Schema: Схема с типами колонок.
+
+    """
+    types = {
+        int: pa.int32(),
+        str: pa.string(),
+        str | None: pa.string(),
+        float: pa.float64(),
+        date: pa.date32(),
+    }
+    model_fields = ExpandedTradingResult.model_fields
+    return pa.schema(
+        [pa.field(name, types[model_fields[name].annotation]) for name in fields]
+    )
+
+
+def build_table(page: Page) -> "pa.Table":
+    """Собирает таблицу Arrow по колонкам из строк результата запроса.
+
+    Колонки берутся из строк страницы, пустая страница получает схему
+    без наименований. Курсор следующей страницы передается в метаданных
+    схемы.
+
+    Returns:
+        pa.Table: Таблица со строками страницы.
+
+    """
+    fields = (
+        page.results[0]._fields if page.results else tuple(TradingResult.model_fields)
+    )
+    schema = trading_results_schema(fields)
+    columns: Sequence = list(zip(*page.results, strict=True)) or [[]] * len(schema)
+    table = pa.Table.from_arrays(
+        [
+            pa.array(values, type=field.type)
+            for values, field in zip(columns, schema, strict=True)
+        ],
+        schema=schema,
+    )
+    if page.next_cursor:
+        table = table.replace_schema_metadata({"next_cursor": page.next_cursor})
+    return table
+
+
+def encode_arrow(page: Page) -> bytes:
+    table = build_table(page)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_parquet(page: Page) -> bytes:
+    buffer = BytesIO()
+    pq.write_table(build_table(page), buffer)
+    return buffer.getvalue()
+
+
+@dataclass(frozen=True)
+class ResponseFormat:
+    """Формат ответа: имя для ключа кэша, MIME-тип и кодировщик."""
+
+    name: str
+    media_type: str
+    encode: Callable[[Any], bytes]
+    available: bool = True
+
+
+JSON = ResponseFormat("json", "application/json", encode_json)
+ARROW = ResponseFormat(
+    "arrow", "application/vnd.apache.arrow.stream", encode_arrow, pa is not None
+)
+PARQUET = ResponseFormat(
+    "parquet", "application/vnd.apache.parquet", encode_parquet, pa is not None
+)
+
+TABLE_FORMATS = (JSON, ARROW, PARQUET)
+FORMATS = {response_format.name: response_format for response_format in TABLE_FORMATS}
+
+
+def parse_weight(params: Sequence[str]) -> float:
+    """Вес `q` медиа-типа из его параметров в заголовке Accept.
+
+    Returns:
+        float: Вес от 0 до 1, по умолчанию 1; некорректный вес равен 0.
+
+    """
+    weight = 1.0
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+    return weight
+
+
+def parse_accept(accept: str) -> list[str]:
+    """Разбирает заголовок Accept в порядке предпочтения клиента.
+
+    Returns:
+        list[str]: Медиа-типы по убыванию веса, при равном весе в порядке
+            заголовка; типы с `q=0` отброшены.
+
+    """
+    ranges = []
+    for position, item in enumerate(accept.split(",")):
+        media_range, *params = (part.strip() for part in item.split(";"))
+        weight = parse_weight(params)
+        if weight > 0:
+            ranges.append((-weight, position, media_range.lower()))
+    return [media_range for _, _, media_range in sorted(ranges)]
+
+
+def match_format(
+    media_range: str, formats: Sequence[ResponseFormat]
+) -> ResponseFormat | None:
+    """Формат ответа для одного медиа-типа из Accept.
+
+    Returns:
+        ResponseFormat | None: JSON для `*/*` и `application/*`, подходящий
+            доступный формат или None.
+
+    """
+    if media_range in {"*/*", "application/*"}:
+        return JSON
+    for response_format in formats:
+        if response_format.media_type == media_range:
+            return response_format if response_format.available else None
+    return None
+
+
+def negotiate(
+    accept: str | None, formats: Sequence[ResponseFormat] = (JSON,)
+) -> ResponseFormat:
+    """Выбирает формат ответа по заголовку Accept с учетом q-весов.
+
+    Returns:
+        ResponseFormat: Первый поддерживаемый формат, JSON по умолчанию.
+
+    """
+    if not accept:
+        return JSON
+
+    for media_range in parse_accept(accept):
+        response_format = match_format(media_range, formats)
+        if response_format is not None:
+            return response_format
+
+    raise HTTPException(
+        status_code=406,
+        detail="Supported formats: "
+        + ", ".join(f.media_type for f in formats if f.available),
+    )
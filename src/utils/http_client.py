@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Self
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from src.settings.config import settings
+from src.utils.download_cache import CacheMissError, DownloadCache
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class HostStats:
+    """Статистика запросов к одному хосту."""
+
+    requests: int = 0
+    not_modified: int = 0
+    cache_hits: int = 0
+    failures: int = 0
+    retries: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+
+class HttpClient:
+    """Общая HTTP-сессия с пулом соединений, ограничением параллелизма,
+    таймаутами и повторами с экспоненциальной задержкой.
+
+    Если передан `cache`, файлы из `get_bytes` сохраняются на диск и
+    ревалидируются условными запросами, а в режиме `offline` отдаются только
+    из кэша.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int,
+        concurrency: int,
+        timeout: float,
+        retries: int,
+        backoff: float,
+        cache: DownloadCache | None = None,
+        offline: bool = False,
+    ) -> None:
+        self.limit = limit
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.offline = offline
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.stats: dict[str, HostStats] = defaultdict(HostStats)
+        self.session: aiohttp.ClientSession | None = None
+        self.started = 0.0
+
+    @classmethod
+    def from_settings(cls, *, offline: bool = False) -> Self:
+        return cls(
+            limit=settings.PARSER_HTTP_LIMIT,
+            concurrency=settings.PARSER_HTTP_CONCURRENCY,
+            timeout=settings.PARSER_HTTP_TIMEOUT,
+            retries=settings.PARSER_HTTP_RETRIES,
+            backoff=settings.PARSER_HTTP_BACKOFF,
+            cache=DownloadCache.from_settings(),
+            offline=offline,
+        )
+
+    async def __aenter__(self) -> Self:
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.limit),
+            timeout=self.timeout,
+        )
+        self.started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.session.close()
+        if self.cache is not None:
+            self.cache.save()
+        self.log_stats()
+
+    async def get_text(self, url: str) -> str:
+        """Возвращает тело ответа в виде строки."""
+        return await self.request(url, aiohttp.ClientResponse.text)
+
+    async def get_bytes(self, url: str) -> bytes:
+        """Возвращает тело ответа в виде байтов, используя дисковый кэш."""
+        if self.cache is None:
+            return await self.request(url, aiohttp.ClientResponse.read)
+
+        entry = self.cache.get(url)
+        if self.offline:
+            if entry is None:
+                raise CacheMissError(url)
+            self.stats[urlsplit(url).netloc].cache_hits += 1
+            return self.cache.read(url)
+
+        response, content = await self.request(
+            url,
+            self._read_with_validators,
+            headers=entry.validators() if entry else None,
+        )
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            try:
+                content = self.cache.read(url)
+            except CacheMissError:
+                # Запись в индексе пережила файл: скачиваем заново без валидаторов.
+                response, content = await self.request(url, self._read_with_validators)
+            else:
+                self.stats[urlsplit(url).netloc].not_modified += 1
+                return content
+
+        self.cache.put(
+            url,
+            content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return content
+
+    async def download(self, url: str) -> bytes | None:
+        """Скачивает файл через `get_bytes`, не прерывая остальные загрузки.
+
+        Returns:
+            bytes | None: Содержимое файла или None, если его не удалось
+                получить после всех повторов.
+
+        """
+        try:
+            return await self.get_bytes(url)
+        except (aiohttp.ClientError, TimeoutError, CacheMissError, OSError):
+            logger.exception("Не удалось скачать %s", url)
+            return None
+
+    @staticmethod
+    async def _read_with_validators(
+        response: aiohttp.ClientResponse,
+    ) -> tuple[aiohttp.ClientResponse, bytes]:
+        return response, await response.read()
+
+    async def request(
+        self,
+        url: str,
+        read: Callable[[aiohttp.ClientResponse], Awaitable],
+        headers: dict[str, str] | None = None,
+    ) -> object:
+        """Выполняет GET-запрос с повторами при сетевых ошибках и 5xx/429.
+
+        Returns:
+            object: Результат `read` для успешного ответа.
+
+        """
+        stats = self.stats[urlsplit(url).netloc]
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                async with (
+                    self.semaphore,
+                    self.session.get(url, headers=headers) as response,
+                ):
+                    response.raise_for_status()
+                    body = await read(response)
+                    received = response.content.total_bytes
+            except (aiohttp.ClientError, TimeoutError) as error:
+                stats.elapsed += time.perf_counter() - start
+                retryable = (
+                    not isinstance(error, aiohttp.ClientResponseError)
+                    or error.status in RETRYABLE_STATUSES
+                )
+                if not retryable or attempt == self.retries:
+                    stats.failures += 1
+                    raise
+                stats.retries += 1
+                delay = self.backoff * 2**attempt
+                logger.warning(
+                    "Ошибка запроса %s (%r), повтор через %.1f с", url, error, delay
+                )
+                await asyncio.sleep(delay)
+            else:
+                stats.requests += 1
+                stats.bytes += received
+                stats.elapsed += time.perf_counter() - start
+                return body
+        return None
+
+    def log_stats(self) -> None:
+        """Логирует объем и скорость загрузки, а также ошибки по хостам."""
+        wall_time = time.perf_counter() - self.started
+        for host, stats in self.stats.items():
+            attempts = stats.requests + stats.failures + stats.retries
+            logger.info(
+                "%s: запросов %s (не изменилось %s, из кэша %s), ошибок %s, "
+                "повторов %s, %.1f КБ за %.1f с (%.1f КБ/с), "
+                "средняя задержка %.0f мс",
+                host,
+                stats.requests,
+                stats.not_modified,
+                stats.cache_hits,
+                stats.failures,
+                stats.retries,
+                stats.bytes / 1024,
+                wall_time,
+                stats.bytes / 1024 / wall_time if wall_time else 0,
+                stats.elapsed / attempts * 1000 if attempts else 0,
+            )
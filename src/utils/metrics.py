@@ -0,0 +1,191 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext, ExecutionContext
+from sqlalchemy.engine.interfaces import DBAPICursor
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки запроса до отправки последнего байта ответа.",
+    ["method", "route", "status"],
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Время выполнения одного SQL-запроса.",
+)
+DB_REQUEST_QUERIES = Histogram(
+    "db_request_queries",
+    "Количество SQL-запросов за один HTTP-запрос.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50),
+)
+DB_REQUEST_DURATION = Histogram(
+    "db_request_duration_seconds",
+    "Суммарное время SQL-запросов за один HTTP-запрос.",
+    ["route"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Обращения к кэшу ответов.",
+    ["namespace", "result"],
+)
+CACHE_OPERATION_DURATION = Histogram(
+    "cache_operation_duration_seconds",
+    "Время чтения и записи кэша ответов.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Соединения пула по состояниям: size, checked_out, overflow.",
+    ["pool", "state"],
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Отставание реплики от primary при последней проверке.",
+    ["replica"],
+)
+
+
+@dataclass
+class RequestStats:
+    """Счетчики SQL-запросов, выполненных в рамках одного HTTP-запроса."""
+
+    queries: int = 0
+    duration: float = 0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine, pool: str = "primary") -> None:
+    """Подключает к движку сбор времени запросов и состояния пула.
+
+    Запросы дольше `METRICS_SLOW_QUERY_MS` пишутся в лог с текстом SQL.
+    Значения параметров могут содержать данные пользователей, поэтому они
+    попадают в лог только при `METRICS_SLOW_QUERY_PARAMETERS`.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        many: bool,  # noqa: FBT001 - сигнатура события SQLAlchemy
+    ) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        many: bool,  # noqa: FBT001 - сигнатура события SQLAlchemy
+    ) -> None:
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_DURATION.observe(duration)
+
+        stats = request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.duration += duration
+
+        threshold = settings.METRICS_SLOW_QUERY_MS
+        if threshold is None or duration * 1000 < threshold:
+            return
+        if settings.METRICS_SLOW_QUERY_PARAMETERS:
+            logger.warning(
+                "Медленный запрос (%.1f мс): %s %s",
+                duration * 1000,
+                " ".join(statement.split()),
+                parameters,
+            )
+        else:
+            logger.warning(
+                "Медленный запрос (%.1f мс): %s",
+                duration * 1000,
+                " ".join(statement.split()),
+            )
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context: ExceptionContext) -> None:
+        if context.connection is not None and context.connection.info.get(
+            "query_start"
+        ):
+            context.connection.info["query_start"].pop()
+
+    states = {"size": "size", "checked_out": "checkedout", "overflow": "overflow"}
+    for state, method in states.items():
+        function = getattr(engine.pool, method, None)
+        if function is not None:
+            DB_POOL_CONNECTIONS.labels(pool, state).set_function(function)
+
+
+def route_template(scope: Scope) -> str:
+    """Шаблон пути маршрута, чтобы не плодить метки на каждый URL.
+
+    Returns:
+        str: Путь маршрута вида `/api/trading_results` или `<unmatched>`.
+
+    """
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """ASGI-middleware, измеряющее время запроса и работу с БД по маршрутам.
+
+    Время считается до отправки последнего куска тела, поэтому потоковые
+    выгрузки учитываются целиком, а не до первого байта.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, status).observe(
+                time.perf_counter() - start
+            )
+            DB_REQUEST_QUERIES.labels(route).observe(stats.queries)
+            DB_REQUEST_DURATION.labels(route).observe(stats.duration)
+            request_stats.reset(token)
@@ -0,0 +1,41 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from fastapi import HTTPException
+
+
+@dataclass
+class Page:
+    """Страница результатов и курсор для запроса следующей страницы."""
+
+    results: list[Any]
+    next_cursor: str | None = None
+
+
+def encode_cursor(value: date, row_id: int) -> str:
+    """Кодирует позицию (дата, id) последней строки страницы.
+
+    Returns:
+        str: Непрозрачный токен для параметра `cursor`.
+
+    """
+    raw = f"{value.isoformat()}:{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[date, int]:
+    """Восстанавливает позицию (дата, id) из токена.
+
+    Returns:
+        tuple[date, int]: Дата и id строки, после которой начинается страница.
+
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        value, row_id = raw.split(":")
+        return date.fromisoformat(value), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise HTTPException(status_code=400, detail="Invalid `cursor`.") from error
@@ -3,8 +3,6 @@ from collections.abc import AsyncGenerator
 
 import pytest
 import pytest_asyncio
-from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import Result, sql
 from sqlalchemy.ext.asyncio import (
@@ -14,12 +12,15 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from models import SpimexTradingResults
+from models import SpimexDeliveryBasis, SpimexProduct, SpimexTradingResults
 from src.app import app
+from src.database.replicas import ReplicaRouter
 from src.models.base import Base
-from src.routers.trading_results import get_db
+from src.repository.trading_daily import TradingDailyRepository
+from src.routers.trading_results import get_read_sessions
 from src.settings.config import settings
-from tests.fixtures import TRADING_RESULTS
+from src.utils.cache import InMemoryCacheBackend, response_cache
+from tests.fixtures import DELIVERY_BASES, PRODUCTS, TRADING_RESULTS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -33,11 +34,12 @@ DATABASE_URL = (
     f"@{settings.DB_HOST}:{settings.DB_PORT}/"
 )
 TEST_DATABASE_URL = f"{DATABASE_URL}{settings.DB_NAME}"
+REPLICA_DB_NAME = f"{settings.DB_NAME}_replica"
 
 
 @pytest.fixture(scope="function", autouse=True)
 def initialize_cache():
-    FastAPICache.init(InMemoryBackend(), prefix="test-cache")
+    response_cache.init(InMemoryCacheBackend())
 
 
 @pytest_asyncio.fixture(scope="function", autouse=True)
@@ -98,6 +100,32 @@ async def setup_db(test_engine: AsyncEngine):
     logger.info("Таблицы пересозданы")
 
 
+@pytest_asyncio.fixture
+async def replica_session_maker() -> AsyncGenerator[async_sessionmaker, None]:
+    """Вторая локальная база в роли реплики с теми же таблицами."""
+    nodb_engine = create_async_engine(DATABASE_URL, isolation_level="AUTOCOMMIT")
+    async with nodb_engine.connect() as connection:
+        await connection.execute(
+            sql.text(f"DROP DATABASE IF EXISTS {REPLICA_DB_NAME} WITH (FORCE)")
+        )
+        await connection.execute(sql.text(f"CREATE DATABASE {REPLICA_DB_NAME}"))
+
+    replica_engine = create_async_engine(f"{DATABASE_URL}{REPLICA_DB_NAME}")
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(
+        replica_engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+    await replica_engine.dispose()
+    async with nodb_engine.connect() as connection:
+        await connection.execute(
+            sql.text(f"DROP DATABASE IF EXISTS {REPLICA_DB_NAME} WITH (FORCE)")
+        )
+    await nodb_engine.dispose()
+
+
 @pytest_asyncio.fixture
 async def async_session_maker(test_engine: AsyncEngine) -> async_sessionmaker:
     """Создаёт async_sessionmaker."""
@@ -124,20 +152,17 @@ async def session(
 async def client(
     async_session_maker: async_sessionmaker,
 ) -> AsyncGenerator[AsyncClient, None]:
-    """Возвращает клиент для тестирования эндпоинтов FastAPI с переопределённой зависимостью get_db."""
-
-    async def get_test_db() -> AsyncGenerator[AsyncSession, None]:
-        async with async_session_maker() as session:
-            yield session
-
-    app.dependency_overrides[get_db] = get_test_db
+    """Возвращает клиент для тестирования эндпоинтов FastAPI с переопределённой фабрикой сессий."""
+    app.dependency_overrides[get_read_sessions] = lambda: ReplicaRouter(
+        async_session_maker, [], max_lag=0, check_interval=0
+    )
 
     transport = ASGITransport(app)
 
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
-    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_sessions, None)
 
 
 @pytest_asyncio.fixture
@@ -149,4 +174,10 @@ async def setup_trading_results(async_session_maker: async_sessionmaker):
             for data in TRADING_RESULTS:
                 trading_result = SpimexTradingResults(**data)
                 session.add(trading_result)
+            session.add_all(SpimexProduct(**data) for data in PRODUCTS)
+            session.add_all(SpimexDeliveryBasis(**data) for data in DELIVERY_BASES)
+            await session.flush()
+            await TradingDailyRepository(session).refresh(
+                {data["date"] for data in TRADING_RESULTS}
+            )
     logger.info("Тестовые данные успешно добавлены")
@@ -1,15 +1,25 @@
 """Данные, используемые в тестах."""
 
 __all__ = [
+    "DELIVERY_BASES",
+    "PARAMS_TEST_GET_AGGREGATES_ENDPOINT",
     "PARAMS_TEST_GET_DYNAMICS_ENDPOINT",
     "PARAMS_TEST_GET_LAST_TRADING_DATES_ENDPOINT",
     "PARAMS_TEST_GET_TRADING_RESULTS_ENDPOINT",
+    "PARAMS_TEST_READ_BULLETIN",
+    "PRODUCTS",
     "TRADING_RESULTS",
 ]
 
-from tests.fixtures.postgres.trading_results import TRADING_RESULTS
+from tests.fixtures.postgres.trading_results import (
+    DELIVERY_BASES,
+    PRODUCTS,
+    TRADING_RESULTS,
+)
 from tests.fixtures.test_cases import (
+    PARAMS_TEST_GET_AGGREGATES_ENDPOINT,
     PARAMS_TEST_GET_DYNAMICS_ENDPOINT,
     PARAMS_TEST_GET_LAST_TRADING_DATES_ENDPOINT,
     PARAMS_TEST_GET_TRADING_RESULTS_ENDPOINT,
+    PARAMS_TEST_READ_BULLETIN,
 )
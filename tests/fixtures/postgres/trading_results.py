@@ -4,10 +4,8 @@ TRADING_RESULTS = [
     {
         "id": 1,
         "exchange_product_id": "A100NVY060F",
-        "exchange_product_name": "Бензин (АИ-100-К5), ст. Новоярославская (ст. отправления)",
         "oil_id": "A100",
         "delivery_basis_id": "NVY",
-        "delivery_basis_name": "ст. Новоярославская",
         "delivery_type_id": "F",
         "volume": 120,
         "total": 10796820,
@@ -17,10 +15,8 @@ TRADING_RESULTS = [
     {
         "id": 2,
         "exchange_product_id": "A592BIN061J",
-        "exchange_product_name": "Бензин (АИ-92-К5) по ГОСТ, ст. Биклянь (ст. отправления ОТП)",
         "oil_id": "A592",
         "delivery_basis_id": "BIN",
-        "delivery_basis_name": "ст. Биклянь",
         "delivery_type_id": "J",
         "volume": 122,
         "total": 7118151,
@@ -28,3 +24,29 @@ TRADING_RESULTS = [
         "date": date(2023, 1, 2),
     },
 ]
+
+PRODUCTS = [
+    {
+        "exchange_product_id": "A100NVY060F",
+        "exchange_product_name": "Бензин (АИ-100-К5), ст. Новоярославская (ст. отправления)",
+        "date": date(2023, 1, 1),
+    },
+    {
+        "exchange_product_id": "A592BIN061J",
+        "exchange_product_name": "Бензин (АИ-92-К5) по ГОСТ, ст. Биклянь (ст. отправления ОТП)",
+        "date": date(2023, 1, 2),
+    },
+]
+
+DELIVERY_BASES = [
+    {
+        "delivery_basis_id": "NVY",
+        "delivery_basis_name": "ст. Новоярославская",
+        "date": date(2023, 1, 1),
+    },
+    {
+        "delivery_basis_id": "BIN",
+        "delivery_basis_name": "ст. Биклянь",
+        "date": date(2023, 1, 2),
+    },
+]
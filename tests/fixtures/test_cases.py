@@ -37,3 +37,59 @@ PARAMS_TEST_GET_DYNAMICS_ENDPOINT = [
         does_not_raise(),
     ),
 ]
+
+PARAMS_TEST_GET_AGGREGATES_ENDPOINT = [
+    (
+        "/api/aggregates?start_date=2023-01-01&end_date=2023-01-31&period=month",
+        200,
+        [
+            {
+                "period": "2023-01-01",
+                "oil_id": "A100",
+                "volume": 120.0,
+                "total": 10796820.0,
+                "count": 2.0,
+                "vwap": 89973.5,
+            },
+            {
+                "period": "2023-01-01",
+                "oil_id": "A592",
+                "volume": 122.0,
+                "total": 7118151.0,
+                "count": 3.0,
+                "vwap": 58345.5,
+            },
+        ],
+        does_not_raise(),
+    ),
+    (
+        "/api/aggregates?start_date=2023-01-01&end_date=2023-01-31"
+        "&period=week&group_by=delivery_type_id&delivery_basis_id=BIN",
+        200,
+        [
+            {
+                "period": "2023-01-02",
+                "delivery_type_id": "J",
+                "volume": 122.0,
+                "total": 7118151.0,
+                "count": 3.0,
+                "vwap": 58345.5,
+            },
+        ],
+        does_not_raise(),
+    ),
+    (
+        "/api/aggregates?start_date=2023-01-31&end_date=2023-01-01",
+        400,
+        {"detail": "`start_date` must be less than or equal to `end_date`."},
+        does_not_raise(),
+    ),
+]
+
+PARAMS_TEST_READ_BULLETIN = [
+    ("oil_xls_20230301162000.xls", "01.03.2023", 84),
+    ("oil_xls_20231115162000.xls", "15.11.2023", 115),
+    ("oil_xls_20240603162000.xls", "03.06.2024", 129),
+    ("oil_xls_20241220162000.xls", "20.12.2024", 153),
+    ("oil_xls_20250910162000.xls", "10.09.2025", 160),
+]
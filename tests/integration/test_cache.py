@@ -0,0 +1,200 @@
+"""Интеграционные тесты для кэша ответов."""
+
+import asyncio
+from datetime import date
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.app import app
+from src.database.replicas import ReplicaRouter
+from src.filters.trading_results import TradingResultsFilter
+from src.repository.trading_results import TradingResultsRepository
+from src.routers.trading_results import get_read_sessions
+from src.utils.cache import InMemoryCacheBackend, ResponseCache, response_cache
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_repeated_request_is_served_from_cache(self, client):
+        first = await client.get("/api/trading_results?oil_id=A100")
+        second = await client.get("/api/trading_results?oil_id=A100")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.content == first.content
+        assert response_cache.stats() == {"trading_results": {"hits": 1, "misses": 1}}
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_different_filters_are_cached_separately(self, client):
+        first = await client.get("/api/trading_results?oil_id=A100")
+        second = await client.get("/api/trading_results?oil_id=A600")
+
+        assert second.headers["X-Cache"] == "MISS"
+        assert first.json() != second.json()
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_cache_hit_does_not_open_session(self, client, async_session_maker):
+        opened = 0
+
+        def sessions():
+            nonlocal opened
+            opened += 1
+            return async_session_maker()
+
+        app.dependency_overrides[get_read_sessions] = lambda: ReplicaRouter(
+            sessions, [], max_lag=0, check_interval=0
+        )
+        await client.get("/api/trading_results?oil_id=A100")
+        await client.get("/api/trading_results?oil_id=A100")
+
+        assert opened == 1
+
+    def test_key_depends_only_on_filter_values(self):
+        def make_filter(oil_id: str) -> TradingResultsFilter:
+            return TradingResultsFilter(
+                cursor=None,
+                per_page=100,
+                oil_id=oil_id,
+                delivery_type_id=None,
+                delivery_basis_id=None,
+                expand=False,
+            )
+
+        key = response_cache.make_key("trading_results", make_filter("A100"))
+
+        assert key == response_cache.make_key("trading_results", make_filter("A100"))
+        assert key != response_cache.make_key("dynamics", make_filter("A100"))
+        assert key != response_cache.make_key("trading_results", make_filter("A200"))
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_invalidate_keeps_unaffected_date_ranges(self, client):
+        affected = "/api/dynamics?start_date=2023-01-01&end_date=2023-01-02"
+        unaffected = "/api/dynamics?start_date=2022-12-01&end_date=2022-12-31"
+        for url in (affected, unaffected, "/api/trading_results"):
+            await client.get(url)
+
+        assert await response_cache.invalidate(dates={date(2023, 1, 2)}) == 2
+
+        assert (await client.get(affected)).headers["X-Cache"] == "MISS"
+        assert (await client.get(unaffected)).headers["X-Cache"] == "HIT"
+        assert (await client.get("/api/trading_results")).headers["X-Cache"] == "MISS"
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_warm_up_recomputes_popular_keys(self, client):
+        await client.get("/api/trading_results?oil_id=A100")
+        await client.get("/api/last_trading_dates?days=5")
+        await response_cache.invalidate()
+
+        async with AsyncClient(
+            transport=ASGITransport(app), base_url="http://test/api"
+        ) as api_client:
+            assert await response_cache.warm_up(api_client, limit=1) == 1
+
+        response = await client.get("/api/trading_results?oil_id=A100")
+        assert response.headers["X-Cache"] == "HIT"
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_warm_up_continues_after_failed_key(self, client, monkeypatch):
+        await client.get("/api/trading_results?oil_id=A100")
+        await client.get("/api/trading_results?oil_id=A100")
+        await client.get("/api/last_trading_dates?days=5")
+        await response_cache.invalidate()
+
+        async def get_last_trading_dates(self, days):
+            raise RuntimeError("database is down")
+
+        monkeypatch.setattr(
+            TradingResultsRepository, "get_last_trading_dates", get_last_trading_dates
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app), base_url="http://test/api"
+        ) as api_client:
+            assert await response_cache.warm_up(api_client, limit=2) == 1
+
+    @pytest.mark.asyncio
+    async def test_ranking_keeps_most_requested_keys(self):
+        backend = InMemoryCacheBackend(ranking_size=2)
+        for key in ["a", "a", "a", "b", "b", "c", "d", "e"]:
+            await backend.get(key, "ranking")
+
+        assert await backend.top("ranking", 10) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_new_key_overtakes_old_one_in_full_ranking(self):
+        backend = InMemoryCacheBackend(ranking_size=2)
+        for key in ["a", "a", "a", "b", "b", "c", "d", "e"]:
+            await backend.get(key, "ranking")
+
+        for key in ["f", "f", "f", "f"]:
+            await backend.get(key, "ranking")
+
+        assert await backend.top("ranking", 2) == ["f", "a"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_computed_once(self):
+        calls = 0
+
+        async def compute() -> list[int]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return [calls]
+
+        responses = await asyncio.gather(
+            *(response_cache.respond("test", {"id": 1}, compute) for _ in range(10))
+        )
+
+        assert calls == 1
+        assert {response.body for response in responses} == {b"[1]"}
+        assert [response.headers["X-Cache"] for response in responses].count(
+            "MISS"
+        ) == 1
+
+    @pytest.mark.asyncio
+    async def test_local_cache_skips_backend(self):
+        backend = InMemoryCacheBackend()
+        response_cache.init(backend)
+
+        async def compute() -> list[int]:
+            return [1]
+
+        await response_cache.respond("test", {"id": 1}, compute)
+        backend.values.clear()
+        response = await response_cache.respond("test", {"id": 1}, compute)
+
+        assert response.headers["X-Cache"] == "HIT"
+        assert response.body == b"[1]"
+
+    @pytest.mark.asyncio
+    async def test_stale_response_while_revalidating(self):
+        cache = ResponseCache(local_ttl=0, stale_ttl=60)
+        cache.init(InMemoryCacheBackend())
+        release = asyncio.Event()
+
+        async def compute(value: int) -> list[int]:
+            await release.wait()
+            return [value]
+
+        release.set()
+        await cache.respond("test", {"id": 1}, lambda: compute(1))
+        await cache.invalidate()
+        release.clear()
+
+        refresh = asyncio.create_task(
+            cache.respond("test", {"id": 1}, lambda: compute(2))
+        )
+        await asyncio.sleep(0)
+        stale = await cache.respond("test", {"id": 1}, lambda: compute(3))
+        release.set()
+
+        refreshed = await refresh
+
+        assert (stale.headers["X-Cache"], stale.body) == ("STALE", b"[1]")
+        assert (refreshed.headers["X-Cache"], refreshed.body) == ("MISS", b"[2]")
@@ -0,0 +1,72 @@
+"""Интеграционные тесты для форматов Arrow и Parquet."""
+
+import io
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+
+class TestTableFormats:
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_get_dynamics_arrow(self, client):
+        response = await client.get(
+            "/api/dynamics?start_date=2023-01-01&end_date=2023-01-02&per_page=1",
+            headers={"Accept": "application/vnd.apache.arrow.stream"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.column("exchange_product_id").to_pylist() == ["A100NVY060F"]
+        assert table.schema.field("date").type == pa.date32()
+        assert b"next_cursor" in table.schema.metadata
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_get_trading_results_parquet(self, client):
+        response = await client.get(
+            "/api/trading_results",
+            headers={
+                "Accept": "application/vnd.apache.parquet, application/json;q=0.5"
+            },
+        )
+
+        assert response.status_code == 200
+        df = pd.read_parquet(io.BytesIO(response.content))
+        assert df["exchange_product_id"].tolist() == ["A592BIN061J", "A100NVY060F"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_get_dynamics_arrow_expand(self, client):
+        response = await client.get(
+            "/api/dynamics?start_date=2023-01-01&end_date=2023-01-02&expand=true",
+            headers={"Accept": "application/vnd.apache.arrow.stream"},
+        )
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.column("delivery_basis_name").to_pylist() == [
+            "ст. Новоярославская",
+            "ст. Биклянь",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unsupported_format(self, client):
+        response = await client.get(
+            "/api/trading_results", headers={"Accept": "application/xml"}
+        )
+        assert response.status_code == 406
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_formats_are_cached_separately(self, client):
+        await client.get("/api/trading_results")
+        response = await client.get(
+            "/api/trading_results",
+            headers={"Accept": "application/vnd.apache.arrow.stream"},
+        )
+
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
@@ -0,0 +1,125 @@
+"""Тесты HTTP-клиента парсера."""
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.download_cache import CacheMissError, DownloadCache
+from src.utils.http_client import HttpClient
+
+
+@pytest.fixture
+async def server():
+    attempts = {"flaky": 0}
+
+    async def flaky(request: web.Request) -> web.Response:
+        attempts["flaky"] += 1
+        if attempts["flaky"] < 3:
+            return web.Response(status=503)
+        return web.Response(body=b"xls")
+
+    async def missing(request: web.Request) -> web.Response:
+        return web.Response(status=404)
+
+    async def bulletin(request: web.Request) -> web.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=b"bulletin", headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/missing", missing)
+    app.router.add_get("/bulletin.xls", bulletin)
+    async with TestServer(app) as test_server:
+        yield test_server
+
+
+def make_client(**kwargs) -> HttpClient:
+    return HttpClient(
+        limit=2, concurrency=2, timeout=5, retries=3, backoff=0.01, **kwargs
+    )
+
+
+class TestHttpClient:
+    @pytest.mark.asyncio
+    async def test_retries_server_errors(self, server):
+        async with make_client() as client:
+            assert await client.get_bytes(str(server.make_url("/flaky"))) == b"xls"
+
+        stats = client.stats[f"{server.host}:{server.port}"]
+        assert (stats.requests, stats.retries, stats.failures) == (1, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self, server):
+        async with make_client() as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.get_bytes(str(server.make_url("/missing")))
+
+        stats = client.stats[f"{server.host}:{server.port}"]
+        assert (stats.requests, stats.retries, stats.failures) == (0, 0, 1)
+
+    @pytest.mark.asyncio
+    async def test_download_returns_none_on_failure(self, server):
+        async with make_client() as client:
+            assert await client.download(str(server.make_url("/missing"))) is None
+            assert await client.download(str(server.make_url("/flaky"))) == b"xls"
+
+    @pytest.mark.asyncio
+    async def test_revalidates_cached_files(self, server, tmp_path):
+        url = str(server.make_url("/bulletin.xls"))
+
+        async with make_client(cache=DownloadCache(tmp_path, 1024)) as client:
+            assert await client.get_bytes(url) == b"bulletin"
+        async with make_client(cache=DownloadCache(tmp_path, 1024)) as client:
+            assert await client.get_bytes(url) == b"bulletin"
+
+        stats = client.stats[f"{server.host}:{server.port}"]
+        assert (stats.requests, stats.not_modified) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_refetches_when_cached_file_is_missing(self, server, tmp_path):
+        url = str(server.make_url("/bulletin.xls"))
+
+        async with make_client(cache=DownloadCache(tmp_path, 1024)) as client:
+            assert await client.get_bytes(url) == b"bulletin"
+        for blob in (tmp_path / "blobs").rglob("*"):
+            if blob.is_file():
+                blob.unlink()
+        cache = DownloadCache(tmp_path, 1024)
+        async with make_client(cache=cache) as client:
+            assert await client.get_bytes(url) == b"bulletin"
+
+        stats = client.stats[f"{server.host}:{server.port}"]
+        assert (stats.requests, stats.not_modified) == (2, 0)
+        assert cache.read(url) == b"bulletin"
+
+    @pytest.mark.asyncio
+    async def test_offline_reads_only_from_cache(self, tmp_path):
+        cache = DownloadCache(tmp_path, 1024)
+        cache.put("https://spimex.com/upload/1.xls", b"bulletin")
+
+        async with make_client(cache=cache, offline=True) as client:
+            assert await client.get_bytes("https://spimex.com/upload/1.xls") == (
+                b"bulletin"
+            )
+            with pytest.raises(CacheMissError):
+                await client.get_bytes("https://spimex.com/upload/2.xls")
+
+
+class TestDownloadCache:
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = DownloadCache(tmp_path, max_bytes=12)
+        cache.put("https://spimex.com/upload/1.xls", b"first")
+        cache.put("https://spimex.com/upload/2.xls", b"second")
+        cache.read("https://spimex.com/upload/1.xls")
+        cache.put("https://spimex.com/upload/3.xls", b"third")
+        cache.save()
+
+        reopened = DownloadCache(tmp_path, max_bytes=12)
+        assert sorted(reopened.urls()) == [
+            "https://spimex.com/upload/1.xls",
+            "https://spimex.com/upload/3.xls",
+        ]
+        assert reopened.read("https://spimex.com/upload/3.xls") == b"third"
+        assert sum(path.is_file() for path in (tmp_path / "blobs").rglob("*")) == 2
@@ -0,0 +1,76 @@
+"""Интеграционные тесты для метрик Prometheus."""
+
+import logging
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.settings.config import settings
+from src.utils.metrics import instrument_engine
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics:
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_request_metrics(self, client, test_engine):
+        instrument_engine(test_engine, pool="test")
+        route = "/api/trading_results"
+        requests = sample(
+            "http_request_duration_seconds_count",
+            method="GET",
+            route=route,
+            status="200",
+        )
+        queries = sample("db_request_queries_sum", route=route)
+        misses = sample(
+            "cache_requests_total", namespace="trading_results", result="miss"
+        )
+
+        await client.get("/api/trading_results?oil_id=A100")
+        await client.get("/api/trading_results?oil_id=A100")
+
+        assert (
+            sample(
+                "http_request_duration_seconds_count",
+                method="GET",
+                route=route,
+                status="200",
+            )
+            == requests + 2
+        )
+        # Второй запрос отдан из кэша и в БД не ходит.
+        assert sample("db_request_queries_sum", route=route) == queries + 1
+        assert (
+            sample("cache_requests_total", namespace="trading_results", result="miss")
+            == misses + 1
+        )
+        assert sample("db_pool_connections", pool="test", state="checked_out") == 0
+
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert 'route="/api/trading_results"' in response.text
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    @pytest.mark.parametrize("with_parameters", [False, True])
+    async def test_slow_query_log(
+        self, client, test_engine, caplog, monkeypatch, with_parameters
+    ):
+        instrument_engine(test_engine, pool="test")
+        monkeypatch.setattr(settings, "METRICS_SLOW_QUERY_MS", 0)
+        monkeypatch.setattr(settings, "METRICS_SLOW_QUERY_PARAMETERS", with_parameters)
+
+        with caplog.at_level(logging.WARNING, logger="src.utils.metrics"):
+            await client.get("/api/trading_results", params={"oil_id": "A100"})
+
+        messages = [
+            record.getMessage()
+            for record in caplog.records
+            if "spimex_trading_results" in record.getMessage()
+        ]
+        assert messages
+        assert any("A100" in message for message in messages) is with_parameters
@@ -0,0 +1,306 @@
+"""Интеграционные тесты парсера бюллетеней."""
+
+import asyncio
+import hashlib
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+
+from src.models import (
+    SpimexBulletin,
+    SpimexDeliveryBasis,
+    SpimexProduct,
+    SpimexTradingDaily,
+    SpimexTradingResults,
+)
+from src.parser import Bulletin, SpimexParser
+from src.repository.bulletins import BulletinsRepository
+from src.settings.config import settings
+from src.utils.cache import response_cache
+from src.utils.http_client import HttpClient
+from tests.fixtures import PARAMS_TEST_READ_BULLETIN
+
+BULLETINS_DIR = Path(__file__).parent.parent / "fixtures" / "bulletins"
+
+
+def make_bulletin(url: str, content_hash: str, volume: int = 120) -> Bulletin:
+    return Bulletin(
+        url=url,
+        date="01.01.2023",
+        content_hash=content_hash,
+        df=pd.DataFrame(
+            {
+                SpimexParser.INSTRUMENT_CODE_COL: ["A100NVY060F"],
+                SpimexParser.INSTRUMENT_NAME_COL: ["Бензин (АИ-100-К5)"],
+                SpimexParser.DELIVERY_BASIS_COL: ["ст. Новоярославская"],
+                SpimexParser.VOLUME_COL: [volume],
+                SpimexParser.TOTAL_COL: [10796820],
+                SpimexParser.COUNT_COL: [2],
+            }
+        ),
+    )
+
+
+class TestSpimexParser:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("ingested", "failed", "expected_links", "expected_pages"),
+        [
+            (["1", "0"], [], ["3", "2"], [1, 2]),
+            # Страница с частью загруженных бюллетеней не останавливает обход.
+            (["2", "0"], [], ["3", "1", "-1"], [1, 2, 3, 4]),
+            # Неудачные бюллетени повторяются, даже если лежат за границей.
+            (["3", "2", "1", "0"], ["-1"], ["-1"], [1]),
+        ],
+    )
+    async def test_incremental_paging_stops_at_ingested(
+        self, monkeypatch, ingested, failed, expected_links, expected_pages
+    ):
+        pages = {
+            1: ["https://spimex.com/upload/3.xls", "https://spimex.com/upload/2.xls"],
+            2: ["https://spimex.com/upload/1.xls", "https://spimex.com/upload/0.xls"],
+            3: ["https://spimex.com/upload/-1.xls"],
+        }
+        requested = []
+
+        async def fetch_links(session, url):
+            page = int(url.rsplit("-", 1)[-1])
+            requested.append(page)
+            return pages.get(page, [])
+
+        def link(name: str) -> str:
+            return f"https://spimex.com/upload/{name}.xls"
+
+        parser = SpimexParser()
+        monkeypatch.setattr(parser, "fetch_links", fetch_links)
+
+        outbox = asyncio.Queue()
+        await parser._list_links(
+            None,
+            {link(name): "hash" for name in ingested},
+            [link(name) for name in failed],
+            outbox,
+        )
+
+        links = [outbox.get_nowait() for _ in range(outbox.qsize())]
+        assert links == [link(name) for name in expected_links]
+        assert requested == expected_pages
+
+    @pytest.mark.asyncio
+    async def test_failed_bulletins_are_retried(self, session, monkeypatch):
+        async def download(client, url):
+            return None
+
+        monkeypatch.setattr(HttpClient, "download", download)
+        links, contents = asyncio.Queue(), asyncio.Queue()
+        for link in ["https://spimex.com/upload/1.xls", None]:
+            links.put_nowait(link)
+
+        parser = SpimexParser()
+        await parser._download_links(HttpClient.from_settings(), links, contents)
+        repository = BulletinsRepository(session)
+        assert await repository.get_failed() == ["https://spimex.com/upload/1.xls"]
+
+        await parser.insert_data_to_db(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")], {}
+        )
+        assert await repository.get_failed() == []
+
+    @pytest.mark.asyncio
+    async def test_changed_bulletin_replaces_rows(self, session):
+        parser = SpimexParser()
+        url = "https://spimex.com/upload/1.xls"
+
+        await parser.insert_data_to_db([make_bulletin(url, "old")], {})
+        await parser.insert_data_to_db(
+            [make_bulletin(url, "new", volume=130)], {url: "old"}
+        )
+
+        volumes = await session.scalars(select(SpimexTradingResults.volume))
+        assert volumes.all() == [130]
+        assert await session.scalar(select(func.count(SpimexBulletin.id))) == 1
+        assert await BulletinsRepository(session).get_ingested() == {url: "new"}
+
+    @pytest.mark.asyncio
+    async def test_changed_bulletin_refreshes_daily_totals(self, session):
+        parser = SpimexParser()
+        url = "https://spimex.com/upload/1.xls"
+
+        await parser.insert_data_to_db([make_bulletin(url, "old")], {})
+        await parser.insert_data_to_db(
+            [make_bulletin(url, "new", volume=130)], {url: "old"}
+        )
+
+        daily = (await session.scalars(select(SpimexTradingDaily))).all()
+        assert [(row.date, row.oil_id, row.volume) for row in daily] == [
+            (date(2023, 1, 1), "A100", 130)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_insert_invalidates_cached_dates(self):
+        affected = response_cache.make_key(
+            "dynamics", {"start_date": date(2023, 1, 1), "end_date": date(2023, 1, 31)}
+        )
+        unaffected = response_cache.make_key(
+            "dynamics",
+            {"start_date": date(2022, 12, 1), "end_date": date(2022, 12, 31)},
+        )
+        for key in (affected, unaffected):
+            await response_cache.backend.set(key, b"[]", 60)
+
+        await SpimexParser().insert_data_to_db(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")], {}
+        )
+
+        assert await response_cache.backend.get(affected) is None
+        assert await response_cache.backend.get(unaffected) == b"[]"
+
+    @pytest.mark.asyncio
+    async def test_reload_does_not_duplicate_rows(self, session):
+        parser = SpimexParser()
+        records = parser.build_records(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")]
+        )
+
+        await parser.bulk_insert_data_to_db(session, records)
+        await parser.bulk_insert_data_to_db(session, records + records)
+        await session.commit()
+
+        assert await session.scalar(select(func.count(SpimexTradingResults.id))) == 1
+
+    @pytest.mark.asyncio
+    async def test_copy_reload_does_not_duplicate_rows(self, session):
+        parser = SpimexParser()
+        records = parser.build_records(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")]
+        )
+
+        await parser.copy_data_to_db(session, records)
+        await session.commit()
+        await parser.copy_data_to_db(session, records + records)
+        await session.commit()
+
+        assert await session.scalar(select(func.count(SpimexTradingResults.id))) == 1
+
+    @pytest.mark.asyncio
+    async def test_insert_keeps_latest_dimension_names(self, session):
+        parser = SpimexParser()
+        bulletins = {
+            "01.01.2023": "Бензин (АИ-100-К5)",
+            "02.01.2023": "Бензин (АИ-100-К5) по ГОСТ",
+            "31.12.2022": "Бензин АИ-100",
+        }
+        for number, (date_, name) in enumerate(bulletins.items()):
+            bulletin = make_bulletin(f"https://spimex.com/upload/{number}.xls", "hash")
+            bulletin.date = date_
+            bulletin.df[SpimexParser.INSTRUMENT_NAME_COL] = name
+            await parser.insert_data_to_db([bulletin], {})
+
+        products = await session.execute(
+            select(SpimexProduct.exchange_product_name, SpimexProduct.date)
+        )
+        assert products.all() == [("Бензин (АИ-100-К5) по ГОСТ", date(2023, 1, 2))]
+        basis = await session.get(SpimexDeliveryBasis, "NVY")
+        assert basis.delivery_basis_name == "ст. Новоярославская"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("loader", ["bulk_insert_data_to_db", "copy_data_to_db"])
+    async def test_loaders_keep_last_duplicate(self, session, loader):
+        parser = SpimexParser()
+        records = parser.build_records(
+            [
+                make_bulletin("https://spimex.com/upload/1.xls", "hash", volume)
+                for volume in (100, 200, 300)
+            ]
+        )
+
+        await getattr(parser, loader)(session, records)
+        await session.commit()
+
+        assert await session.scalar(select(SpimexTradingResults.volume)) == 300
+
+    def test_build_records(self):
+        records = SpimexParser().build_records(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")]
+        )
+
+        assert records == [
+            (
+                "A100NVY060F",
+                "A100",
+                "NVY",
+                "F",
+                120.0,
+                10796820.0,
+                2.0,
+                date(2023, 1, 1),
+            )
+        ]
+
+    @pytest.mark.parametrize(
+        ("filename", "expected_date", "expected_rows"), PARAMS_TEST_READ_BULLETIN
+    )
+    def test_read_bulletin(self, filename, expected_date, expected_rows):
+        date_, df = SpimexParser().read_bulletin(
+            (BULLETINS_DIR / filename).read_bytes()
+        )
+
+        assert date_ == expected_date
+        assert len(df) == expected_rows
+        assert list(df.columns) == [
+            SpimexParser.INSTRUMENT_CODE_COL,
+            SpimexParser.INSTRUMENT_NAME_COL,
+            SpimexParser.DELIVERY_BASIS_COL,
+            SpimexParser.VOLUME_COL,
+            SpimexParser.TOTAL_COL,
+            SpimexParser.COUNT_COL,
+        ]
+        assert not df[SpimexParser.INSTRUMENT_CODE_COL].str.startswith("Итого").any()
+        assert (df[SpimexParser.COUNT_COL] != "-").all()
+
+    @pytest.mark.asyncio
+    async def test_parse_streams_bulletins_to_db(self, session, monkeypatch):
+        files = {
+            f"https://spimex.com/upload/{filename}": filename
+            for filename, _, _ in PARAMS_TEST_READ_BULLETIN
+        }
+
+        broken = "https://spimex.com/upload/broken.xls"
+
+        async def iter_xls_links(client, ingested, failed):
+            for link in [*files, broken, "https://spimex.com/upload/report.pdf"]:
+                yield link
+
+        async def download(client, url):
+            if url == broken:
+                return b"not a workbook"
+            return (BULLETINS_DIR / files[url]).read_bytes()
+
+        parser = SpimexParser()
+        monkeypatch.setattr(parser, "iter_xls_links", iter_xls_links)
+        monkeypatch.setattr(HttpClient, "download", download)
+        monkeypatch.setattr(settings, "PARSER_CACHE_DIR", None)
+        monkeypatch.setattr(settings, "PARSER_WORKERS", 2)
+        monkeypatch.setattr(settings, "PARSER_CHUNK_SIZE", 2)
+        monkeypatch.setattr(settings, "PARSER_QUEUE_SIZE", 1)
+
+        await parser.parse()
+
+        rows = await session.execute(
+            select(SpimexTradingResults.date, func.count())
+            .group_by(SpimexTradingResults.date)
+            .order_by(SpimexTradingResults.date)
+        )
+        assert [(f"{day:%d.%m.%Y}", count) for day, count in rows] == [
+            (expected_date, expected_rows)
+            for _, expected_date, expected_rows in PARAMS_TEST_READ_BULLETIN
+        ]
+        assert await BulletinsRepository(session).get_ingested() == {
+            url: hashlib.sha256((BULLETINS_DIR / filename).read_bytes()).hexdigest()
+            for url, filename in files.items()
+        }
+        # Ошибка разбора одного файла не прерывает запуск.
+        assert await BulletinsRepository(session).get_failed() == [broken]
@@ -0,0 +1,125 @@
+"""Интеграционные тесты для секционирования итогов торгов по дате."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event, func, select, text
+
+from src.filters.dynamics import DynamicsFilter
+from src.models import SpimexBulletin, SpimexTradingDaily, SpimexTradingResults
+from src.parser import SpimexParser, archive_year
+from src.repository.trading_partitions import TradingPartitionsRepository
+from src.repository.trading_results import TradingResultsRepository
+from tests.integration.test_parser import make_bulletin
+
+
+async def explain_dynamics(session, test_engine, start: date, end: date) -> str:
+    """План запроса динамики, который строит репозиторий.
+
+    Returns:
+        str: Текст EXPLAIN.
+
+    """
+    captured = []
+
+    def before_execute(conn, cursor, statement, parameters, context, many):
+        captured.append((statement, parameters))
+
+    data_filter = DynamicsFilter(
+        cursor=None,
+        per_page=100,
+        oil_id=None,
+        delivery_type_id=None,
+        delivery_basis_id=None,
+        start_date=start,
+        end_date=end,
+        expand=False,
+    )
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_execute)
+    try:
+        await TradingResultsRepository(session).get_dynamics(data_filter)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", before_execute)
+
+    statement, parameters = captured[-1]
+    connection = await session.connection()
+    plan = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return "\n".join(line for (line,) in plan)
+
+
+class TestTradingPartitions:
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_ensure_moves_rows_from_default_partition(self, session):
+        repo = TradingPartitionsRepository(session)
+
+        assert await repo.ensure({date(2023, 1, 1)}) == ["spimex_trading_results_y2023"]
+        assert await repo.ensure({date(2023, 5, 1)}) == []
+
+        partitions = await session.scalars(
+            text("SELECT tableoid::regclass::text FROM spimex_trading_results")
+        )
+        assert set(partitions) == {"spimex_trading_results_y2023"}
+
+    @pytest.mark.asyncio
+    async def test_dynamics_reads_only_partitions_of_period(self, session, test_engine):
+        await TradingPartitionsRepository(session).ensure(
+            {date(2022, 1, 1), date(2023, 1, 1), date(2024, 1, 1)}
+        )
+
+        plan = await explain_dynamics(
+            session, test_engine, date(2023, 1, 1), date(2023, 1, 31)
+        )
+        assert "spimex_trading_results_y2023" in plan
+        assert "spimex_trading_results_y2022" not in plan
+        assert "spimex_trading_results_y2024" not in plan
+        assert "spimex_trading_results_default" not in plan
+
+        plan = await explain_dynamics(
+            session, test_engine, date(2022, 12, 1), date(2023, 1, 31)
+        )
+        assert "spimex_trading_results_y2022" in plan
+        assert "spimex_trading_results_y2023" in plan
+        assert "spimex_trading_results_y2024" not in plan
+
+    @pytest.mark.asyncio
+    async def test_parser_creates_partition_for_new_year(self, session):
+        await SpimexParser().insert_data_to_db(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")], {}
+        )
+
+        assert await TradingPartitionsRepository(session).get_years() == {2023}
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_detach_keeps_rows_outside_table(self, session):
+        repo = TradingPartitionsRepository(session)
+        await repo.ensure({date(2023, 1, 1)})
+
+        name = await repo.detach(2023)
+
+        assert await repo.get_years() == set()
+        assert await session.scalar(select(func.count(SpimexTradingResults.id))) == 0
+        assert await session.scalar(text(f"SELECT count(*) FROM {name}")) == 2
+        assert await repo.ensure({date(2023, 1, 1)}) == ["spimex_trading_results_y2023"]
+
+    @pytest.mark.asyncio
+    async def test_detach_missing_partition(self, session):
+        with pytest.raises(LookupError):
+            await TradingPartitionsRepository(session).detach(2023)
+
+    @pytest.mark.asyncio
+    async def test_archive_year_purges_derived_data(self, session, client):
+        await SpimexParser().insert_data_to_db(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")], {}
+        )
+        response = await client.get("/api/last_trading_dates", params={"days": 1})
+        assert response.json() == ["2023-01-01"]
+
+        await archive_year(2023)
+
+        for model in (SpimexBulletin, SpimexTradingDaily):
+            assert await session.scalar(select(func.count()).select_from(model)) == 0
+        response = await client.get("/api/last_trading_dates", params={"days": 1})
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json() == []
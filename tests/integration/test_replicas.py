@@ -0,0 +1,136 @@
+"""Интеграционные тесты для чтения с реплик."""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app import app
+from src.database.replicas import ReplicaRouter
+from src.models import SpimexTradingResults
+from src.parser import SpimexParser
+from src.routers.trading_results import get_read_sessions
+from src.settings.config import settings
+from src.utils.cache import response_cache
+from tests.fixtures import TRADING_RESULTS
+from tests.integration.test_parser import make_bulletin
+
+REPLICA_ONLY = {
+    **TRADING_RESULTS[0],
+    "exchange_product_id": "REPLICA001",
+}
+
+
+@pytest.fixture
+async def replica(replica_session_maker: async_sessionmaker) -> async_sessionmaker:
+    """Реплика со строкой, которой нет в primary."""
+    async with replica_session_maker() as session, session.begin():
+        session.add(SpimexTradingResults(**REPLICA_ONLY))
+    return replica_session_maker
+
+
+def use_router(router: ReplicaRouter) -> None:
+    app.dependency_overrides[get_read_sessions] = lambda: router
+
+
+async def product_ids(client) -> set[str]:
+    response = await client.get("/api/trading_results")
+    return {row["exchange_product_id"] for row in response.json()["results"]}
+
+
+class TestReplicaRouter:
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_reads_go_to_replica(self, client, async_session_maker, replica):
+        router = ReplicaRouter(
+            async_session_maker, [replica], max_lag=10, check_interval=1
+        )
+        use_router(router)
+
+        assert router.choose() is async_session_maker
+        await router.refresh()
+
+        assert await product_ids(client) == {"REPLICA001"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_lagging_replica_falls_back_to_primary(
+        self, client, async_session_maker, replica, monkeypatch
+    ):
+        router = ReplicaRouter(
+            async_session_maker, [replica], max_lag=10, check_interval=1
+        )
+
+        async def lag(replica: async_sessionmaker) -> float:
+            return 60
+
+        monkeypatch.setattr(router, "lag", lag)
+        await router.refresh()
+        use_router(router)
+
+        assert router.choose() is async_session_maker
+        assert "REPLICA001" not in await product_ids(client)
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_reads_go_to_primary_after_invalidation(
+        self, client, async_session_maker, replica, monkeypatch
+    ):
+        router = ReplicaRouter(
+            async_session_maker, [replica], max_lag=10, check_interval=1
+        )
+        await router.refresh()
+        use_router(router)
+        monkeypatch.setattr(response_cache, "write_window", 11)
+
+        await response_cache.invalidate()
+
+        assert "REPLICA001" not in await product_ids(client)
+
+    @pytest.mark.asyncio
+    async def test_replica_without_wal_receiver_is_skipped(
+        self, async_session_maker, replica, monkeypatch
+    ):
+        router = ReplicaRouter(
+            async_session_maker, [replica], max_lag=10, check_interval=1
+        )
+
+        async def lag(replica: async_sessionmaker) -> None:
+            return None
+
+        monkeypatch.setattr(router, "lag", lag)
+        await router.refresh()
+
+        assert router.healthy == []
+        assert router.choose() is async_session_maker
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_is_skipped(self, async_session_maker):
+        unreachable = async_sessionmaker(
+            create_async_engine(
+                f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASS}"
+                f"@{settings.DB_HOST}:{settings.DB_PORT}/missing_replica"
+            ),
+            class_=AsyncSession,
+        )
+        router = ReplicaRouter(
+            async_session_maker, [unreachable], max_lag=10, check_interval=1
+        )
+
+        await router.refresh()
+
+        assert router.healthy == []
+        assert router.choose() is async_session_maker
+
+    @pytest.mark.asyncio
+    async def test_parser_writes_to_primary(
+        self, async_session_maker, replica_session_maker
+    ):
+        await SpimexParser().insert_data_to_db(
+            [make_bulletin("https://spimex.com/upload/1.xls", "hash")], {}
+        )
+
+        count = select(func.count(SpimexTradingResults.id))
+        async with async_session_maker() as session:
+            assert await session.scalar(count) == 1
+        async with replica_session_maker() as session:
+            assert await session.scalar(count) == 0
@@ -1,11 +1,20 @@
 """Интеграционные тесты для эндпоинтов Trading Results."""
 
+import csv
+import io
+
+import orjson
 import pytest
 
+from src.schemas import ExpandedTradingResult, TradingResult, TradingResultsPage
 from tests.fixtures import (
+    DELIVERY_BASES,
+    PARAMS_TEST_GET_AGGREGATES_ENDPOINT,
     PARAMS_TEST_GET_DYNAMICS_ENDPOINT,
     PARAMS_TEST_GET_LAST_TRADING_DATES_ENDPOINT,
     PARAMS_TEST_GET_TRADING_RESULTS_ENDPOINT,
+    PRODUCTS,
+    TRADING_RESULTS,
 )
 
 
@@ -36,7 +45,7 @@ class TestTradingResultsEndpoints:
         with expectation:
             response = await client.get(url)
             assert response.status_code == expected_status_code
-            response_data = response.json()
+            response_data = response.json()["results"]
             assert len(response_data) == len(expected_response)
             for res, exp in zip(response_data, expected_response, strict=False):
                 assert res["exchange_product_id"] == exp["exchange_product_id"]
@@ -53,7 +62,146 @@ class TestTradingResultsEndpoints:
         with expectation:
             response = await client.get(url)
             assert response.status_code == expected_status_code
-            response_data = response.json()
+            response_data = response.json()["results"]
             assert len(response_data) == len(expected_response)
             for res, exp in zip(response_data, expected_response, strict=False):
                 assert res["exchange_product_id"] == exp["exchange_product_id"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    @pytest.mark.parametrize(
+        ("url", "expected_status_code", "expected_response", "expectation"),
+        PARAMS_TEST_GET_AGGREGATES_ENDPOINT,
+    )
+    async def test_get_aggregates(
+        self, url: str, expected_status_code: int, expected_response, expectation, client
+    ):
+        with expectation:
+            response = await client.get(url)
+            assert response.status_code == expected_status_code
+            assert response.json() == expected_response
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_trading_results_cursor_pagination(self, client):
+        first = (await client.get("/api/trading_results?per_page=1")).json()
+        second = (
+            await client.get(
+                f"/api/trading_results?per_page=1&cursor={first['next_cursor']}"
+            )
+        ).json()
+
+        assert [row["id"] for row in first["results"]] == [2]
+        assert [row["id"] for row in second["results"]] == [1]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_dynamics_cursor_pagination(self, client):
+        url = "/api/dynamics?start_date=2023-01-01&end_date=2023-01-02&per_page=1"
+        first = (await client.get(url)).json()
+        second = (await client.get(f"{url}&cursor={first['next_cursor']}")).json()
+
+        assert [row["id"] for row in first["results"]] == [1]
+        assert [row["id"] for row in second["results"]] == [2]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_trading_results_match_response_model(self, client):
+        response = await client.get("/api/trading_results")
+        page = TradingResultsPage.model_validate_json(response.content)
+
+        assert len(page.results) == 2
+        assert all(
+            row.keys() == TradingResult.model_fields.keys()
+            for row in response.json()["results"]
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_trading_results_expand_names(self, client):
+        response = await client.get("/api/trading_results?oil_id=A592&expand=true")
+        page = TradingResultsPage.model_validate_json(response.content)
+
+        assert page.results == [
+            ExpandedTradingResult(
+                **TRADING_RESULTS[1],
+                exchange_product_name=PRODUCTS[1]["exchange_product_name"],
+                delivery_basis_name=DELIVERY_BASES[1]["delivery_basis_name"],
+            )
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_export_dynamics_expand_names(self, client):
+        response = await client.get(
+            "/api/dynamics/export?format=csv&expand=true"
+            "&start_date=2023-01-01&end_date=2023-01-02"
+        )
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["delivery_basis_name"] for row in rows] == [
+            "ст. Новоярославская",
+            "ст. Биклянь",
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("url", "expected_status_code"),
+        [
+            ("/api/trading_results?cursor=not-a-cursor", 400),
+            ("/api/trading_results?per_page=100000", 422),
+        ],
+    )
+    async def test_invalid_pagination(
+        self, url: str, expected_status_code: int, client
+    ):
+        response = await client.get(url)
+        assert response.status_code == expected_status_code
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    async def test_export_dynamics_ndjson(self, client):
+        response = await client.get(
+            "/api/dynamics/export?start_date=2023-01-01&end_date=2023-01-02"
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [orjson.loads(line) for line in response.content.splitlines()]
+        assert [row["exchange_product_id"] for row in rows] == [
+            "A100NVY060F",
+            "A592BIN061J",
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("setup_trading_results")
+    @pytest.mark.parametrize(
+        ("url", "expected_ids"),
+        [
+            (
+                "/api/dynamics/export?format=csv&oil_id=A592"
+                "&start_date=2023-01-01&end_date=2023-01-02",
+                ["A592BIN061J"],
+            ),
+            (
+                "/api/dynamics/export?format=csv&oil_id=A600"
+                "&start_date=2023-01-01&end_date=2023-01-02",
+                [],
+            ),
+        ],
+    )
+    async def test_export_dynamics_csv(self, url: str, expected_ids, client):
+        response = await client.get(url)
+
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["exchange_product_id"] for row in rows] == expected_ids
+
+    @pytest.mark.asyncio
+    async def test_export_dynamics_invalid_period(self, client):
+        response = await client.get(
+            "/api/dynamics/export?start_date=2023-01-02&end_date=2023-01-01"
+        )
+        assert response.status_code == 400